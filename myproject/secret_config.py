@@ -0,0 +1,98 @@
+"""
+The settings payload (a .env file) from Secret Manager, cached on the instance.
+
+Reading the secret costs the google-cloud-secretmanager (gRPC) import and a
+network round trip during settings import. The payload is kept in the
+instance's temporary directory for SECRETS_CACHE_TTL seconds (default 600)
+with its SHA-256, readable by the owner only: a restart within the TTL
+reads the file, and a file that fails the checksum is fetched again.
+SECRETS_CACHE_TTL=0 turns the cache off.
+
+The client is built by the factory at the dotted path SECRET_MANAGER_CLIENT
+(default: secretmanager_client(), the only place google.cloud is imported),
+so tests can swap in a stand-in such as LocalSecretManagerClient.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from contextlib import suppress
+from types import SimpleNamespace
+from typing import Optional
+
+from django.utils.module_loading import import_string
+
+
+DEFAULT_TTL = 600
+DEFAULT_CLIENT = 'myproject.secret_config.secretmanager_client'
+
+
+def secretmanager_client():
+    from google.cloud import secretmanager
+    return secretmanager.SecretManagerServiceClient()
+
+
+class LocalSecretManagerClient:
+    """Stand-in client: every secret version holds the text of the SECRETS_LOCAL_PAYLOAD file."""
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path or os.environ["SECRETS_LOCAL_PAYLOAD"]
+
+    def access_secret_version(self, name: str):
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        return SimpleNamespace(name=name, payload=SimpleNamespace(data=data))
+
+
+def get_client():
+    return import_string(os.environ.get("SECRET_MANAGER_CLIENT", DEFAULT_CLIENT))()
+
+
+def cache_path(name: str) -> str:
+    digest = hashlib.sha256(name.encode()).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), f"django-settings-{digest}.json")
+
+
+def _checksum(payload: str) -> str:
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _read_cache(path: str, ttl: int) -> Optional[str]:
+    try:
+        with open(path, encoding='utf-8') as f:
+            cached = json.load(f)
+        payload = cached['payload']
+        if time.time() - cached['fetched'] <= ttl and _checksum(payload) == cached['sha256']:
+            return payload
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+    return None
+
+
+def _write_cache(path: str, payload: str) -> None:
+    # mkstemp() files are private; the rename never exposes a partial file
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'fetched': time.time(), 'sha256': _checksum(payload), 'payload': payload}, f)
+        os.replace(tmp, path)
+    except OSError:
+        with suppress(OSError):
+            os.unlink(tmp)
+
+
+def load_payload(name: str, ttl: Optional[int] = None, client=None) -> str:
+    """The secret version 'name' as text, from the instance cache when fresh."""
+    ttl = DEFAULT_TTL if ttl is None else ttl
+    path = cache_path(name)
+    if ttl > 0:
+        payload = _read_cache(path, ttl)
+        if payload is not None:
+            return payload
+
+    client = client or get_client()
+    payload = client.access_secret_version(name=name).payload.data.decode("UTF-8")
+    if ttl > 0:
+        _write_cache(path, payload)
+    return payload
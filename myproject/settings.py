@@ -1,11 +1,10 @@
 import io
 import os
+import tempfile
 from urllib.parse import urlparse
 
 import environ
 from django.conf.locale.pl import formats as pl_formats
-from google.cloud import secretmanager
-from google.oauth2 import service_account
 
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
@@ -32,12 +31,14 @@ elif os.getenv("TRAMPOLINE_CI", None):
     )
     env.read_env(io.StringIO(placeholder))
 elif os.environ.get("GOOGLE_CLOUD_PROJECT", None):
-    # Pull secrets from Secret Manager
+    # Pull secrets from Secret Manager, cached on the instance (see myproject.secret_config)
+    from myproject import secret_config
+
     project_id = os.environ.get("GOOGLE_CLOUD_PROJECT")
-    client = secretmanager.SecretManagerServiceClient()
     settings_name = os.environ.get("SETTINGS_NAME", "django_settings")
     name = f"projects/{project_id}/secrets/{settings_name}/versions/latest"
-    payload = client.access_secret_version(name=name).payload.data.decode("UTF-8")
+    ttl = int(os.environ.get("SECRETS_CACHE_TTL", secret_config.DEFAULT_TTL))
+    payload = secret_config.load_payload(name, ttl=ttl)
     env.read_env(io.StringIO(payload))
 else:
     raise Exception("No local .env or GOOGLE_CLOUD_PROJECT detected. No secrets found.")
@@ -49,7 +50,6 @@ else:
 
 SECRET_KEY = env("SECRET_KEY")
 DEBUG = env("DEBUG")
-DEBUG = True
 
 
 
@@ -102,7 +102,6 @@ INSTALLED_APPS = [
 
     # imported
     # 'crispy_forms',
-    'debug_toolbar',
     # 'django_filters',
 
     # own
@@ -110,7 +109,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "todos.profiling.SamplingProfilerMiddleware",
 
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -119,6 +118,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+
+    "todos.generations.CacheGenerationMiddleware",
 ]
 
 ROOT_URLCONF = "myproject.urls"
@@ -178,6 +179,23 @@ DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
 
 
 
+# -----------------------------------------------------------------------------
+# Cache
+
+# Cached changelists (todos.changelist_cache). CACHE_URL picks the backend,
+# e.g. filecache:///var/tmp/todos_cache or rediscache://host:6379/1; the
+# default locmem cache is per process. Entries are keyed by Month versions
+# stored in the database, so every backend stays consistent.
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
+}
+
+# Per-process caches (date hierarchy, calendar rows) of other instances are
+# dropped within this many seconds of a write (todos.generations)
+CACHE_GENERATION_POLL_SECONDS = env.int("CACHE_GENERATION_POLL_SECONDS", default=5)
+
+
+
 # -----------------------------------------------------------------------------
 # Password validation
 
@@ -217,7 +235,9 @@ USE_TZ = True
 if os.getenv('GAE_ENV', '').startswith('standard'):
     # https://medium.com/@umeshsaruk/upload-to-google-cloud-storage-using-django-storages-72ddec2f0d05
 
-    # For media storage in the bucket
+    # For media storage in the bucket (google-auth is imported only here)
+    from google.oauth2 import service_account
+
     GOOGLE_APPLICATION_CREDENTIALS = env("GOOGLE_APPLICATION_CREDENTIALS")
     GS_CREDENTIALS = service_account.Credentials.from_service_account_file(
         GOOGLE_APPLICATION_CREDENTIALS)
@@ -258,6 +278,13 @@ else:
 # -----------------------------------------------------------------------------
 # debug-toolbar
 
+# Local development only: it captures every query and renders a panel
+DEBUG_TOOLBAR = env.bool(
+    "DEBUG_TOOLBAR", default=DEBUG and not os.getenv('GAE_ENV', '').startswith('standard'))
+if DEBUG_TOOLBAR:
+    INSTALLED_APPS.append('debug_toolbar')
+    MIDDLEWARE.insert(1, "debug_toolbar.middleware.DebugToolbarMiddleware")
+
 INTERNAL_IPS = ['127.0.0.1', ]
 # debug-toolbar not rendering problem:
 # https://www.taricorp.net/2020/windows-mime-pitfalls/
@@ -267,5 +294,17 @@ INTERNAL_IPS = ['127.0.0.1', ]
 
 
 
+# -----------------------------------------------------------------------------
+# Request profiling (todos.profiling): off unless one of the first two is set
+
+# Fraction of requests run under cProfile, e.g. 0.01
+PROFILING_SAMPLE_RATE = env.float("PROFILING_SAMPLE_RATE", default=0.0)
+# Requests at least this slow are recorded too (their SQL timings at least)
+PROFILING_SLOW_MS = env.float("PROFILING_SLOW_MS", default=0.0)
+PROFILING_DIR = env("PROFILING_DIR", default=os.path.join(tempfile.gettempdir(), "todos-profiles"))
+PROFILING_MAX_RECORDS = env.int("PROFILING_MAX_RECORDS", default=200)
+
+
+
 # Default 1000 is too low for large inlines in admin
 DATA_UPLOAD_MAX_NUMBER_FIELDS = 10000
@@ -0,0 +1,20 @@
+"""
+Settings of the test suite (pytest.ini).
+
+Without a local .env the project settings use their CI placeholders:
+SQLite and a dummy SECRET_KEY. The debug toolbar and request profiling
+stay off whatever the .env says, as they would change what the tests count.
+"""
+import os
+
+os.environ.setdefault("TRAMPOLINE_CI", "true")
+os.environ["DEBUG_TOOLBAR"] = "false"
+os.environ["PROFILING_SAMPLE_RATE"] = "0"
+os.environ["PROFILING_SLOW_MS"] = "0"
+
+from myproject.settings import *  # noqa: E402,F401,F403
+
+
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
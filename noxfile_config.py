@@ -34,6 +34,6 @@ TEST_CONFIG_OVERRIDE = {
     # A dictionary you want to inject into your test. Don't put any
     # secrets here. These values will override predefined values.
     'envs': {
-        'DJANGO_SETTINGS_MODULE': 'myproject.settings'
+        'DJANGO_SETTINGS_MODULE': 'myproject.test_settings'
     },
 }
@@ -0,0 +1,86 @@
+/*
+ * Save single TODOList cells of the editable changelist as they change,
+ * instead of submitting the whole page formset.
+ *
+ * Each change PATCHes {date, field, value} to the era's "cell/" admin URL
+ * and refreshes the row's "res" and "compl" columns from the response.
+ */
+'use strict';
+{
+    const cellUrl = new URL('cell/', window.location.href);
+
+    function csrfToken() {
+        const input = document.querySelector('#changelist-form [name=csrfmiddlewaretoken]');
+        return input ? input.value : '';
+    }
+
+    function parseName(name) {
+        const match = /^form-(\d+)-(\w+)$/.exec(name || '');
+        return match ? {index: match[1], field: match[2]} : null;
+    }
+
+    function setStatus(input, color, title) {
+        input.style.outline = color ? `2px solid ${color}` : '';
+        input.title = title || '';
+    }
+
+    async function saveCell(input) {
+        const parsed = parseName(input.name);
+        if (!parsed) {
+            return;
+        }
+        const dateInput = document.querySelector(`[name="form-${parsed.index}-date"]`);
+        if (!dateInput) {
+            return;
+        }
+        const value = input.type === 'checkbox' ? input.checked : input.value;
+        setStatus(input, 'gold');
+
+        let response;
+        try {
+            response = await fetch(cellUrl, {
+                method: 'PATCH',
+                credentials: 'same-origin',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': csrfToken(),
+                },
+                body: JSON.stringify({date: dateInput.value, field: parsed.field, value: value}),
+            });
+        } catch (err) {
+            setStatus(input, 'red', String(err));
+            return;
+        }
+        const data = await response.json().catch(() => ({}));
+        if (!response.ok) {
+            setStatus(input, 'red', [].concat(data.error || response.statusText).join(' '));
+            return;
+        }
+        setStatus(input);
+
+        // The saved value is the new baseline for a later full-page save.
+        if (input.type === 'checkbox') {
+            input.defaultChecked = input.checked;
+        } else {
+            input.defaultValue = input.value;
+        }
+        const row = input.closest('tr');
+        for (const column of ['res', 'compl']) {
+            const cell = row && row.querySelector(`td.field-${column}`);
+            if (cell && data[column] !== undefined) {
+                cell.innerHTML = data[column];
+            }
+        }
+    }
+
+    document.addEventListener('DOMContentLoaded', function() {
+        const resultList = document.getElementById('result_list');
+        if (resultList) {
+            resultList.addEventListener('change', function(event) {
+                if (event.target.matches('input, select, textarea')) {
+                    saveCell(event.target);
+                }
+            });
+        }
+    });
+}
@@ -1,18 +1,149 @@
+import datetime
 import re
 from typing import List
 
 from django import template
 from django.conf import settings
+from django.contrib.admin.templatetags.admin_list import pagination, result_list
+from django.contrib.admin.utils import get_fields_from_path
 from django.db.models import Q
 from django.template.defaultfilters import linebreaksbr
+from django.template.loader import render_to_string
 from django.template.defaulttags import GroupedResult
+from django.utils import formats
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
+from django.utils.text import capfirst
+from django.utils.translation import gettext as _
+
+from todos import hierarchy, snapshots
+from todos.models import Month
 
 
 register = template.Library()
 
 
+@register.inclusion_tag('admin/change_list_results.html')
+def labelled_result_list(cl):
+    """Admin's {% result_list %} with column headers from the model's FIELD_LABELS."""
+    if getattr(cl, 'snapshot', None) is not None:
+        context = snapshots.result_list(cl)
+    else:
+        context = result_list(cl)
+    labels = getattr(cl.model, 'FIELD_LABELS', {})
+    for header, field_name in zip(context['result_headers'], cl.list_display):
+        if field_name in labels:
+            header['text'] = labels[field_name]
+    return context
+
+
+@register.simple_tag
+def cached_result_list(cl):
+    """
+    {% labelled_result_list %}, served from and stored to the changelist's
+    fragment cache when it has one (todos.changelist_cache).
+    """
+    if getattr(cl, 'cached_results', None) is not None:
+        return cl.cached_results
+    html = render_to_string('admin/change_list_results.html', labelled_result_list(cl))
+    if hasattr(cl, 'store_results'):
+        cl.store_results(html)
+    return mark_safe(html)
+
+
+@register.simple_tag
+def changelist_pagination(cl):
+    """
+    Admin's {% pagination %}, or newer/older links for a keyset-paginated
+    changelist (todos.pagination). Rendered once per changelist: the bars
+    above and below the results are the same HTML.
+    """
+    if getattr(cl, 'pagination_html', None) is None:
+        if getattr(cl, 'keyset', None) is not None:
+            html = render_to_string('admin/todos/keyset_pagination.html', cl.keyset)
+        else:
+            html = render_to_string('admin/pagination.html', pagination(cl))
+        cl.pagination_html = mark_safe(html)
+    return cl.pagination_html
+
+
+@register.inclusion_tag('admin/date_hierarchy.html')
+def calendar_date_hierarchy(cl):
+    """
+    Admin's {% date_hierarchy %} with years and months read from the Year and
+    Month tables (todos.hierarchy), limited to the era of TODOList proxies.
+    Same URL parameters; no query on the changelist's queryset.
+    """
+    field_name = cl.date_hierarchy
+    month_keyed = get_fields_from_path(cl.model, field_name)[-1].model is Month
+    start, stop = getattr(cl.model, 'START', None), getattr(cl.model, 'END', None)
+    year_field = f"{field_name}__year"
+    month_field = f"{field_name}__month"
+    day_field = f"{field_name}__day"
+    year_lookup = cl.params.get(year_field)
+    month_lookup = cl.params.get(month_field)
+    day_lookup = cl.params.get(day_field)
+
+    def link(filters):
+        return cl.get_query_string(filters, [f"{field_name}__"])
+
+    if not (year_lookup or month_lookup or day_lookup):
+        # select appropriate start level
+        years = hierarchy.years(start, stop)
+        if len(years) == 1:
+            year_lookup = years[0]
+            months = hierarchy.months(year_lookup, start, stop)
+            if len(months) == 1:
+                month_lookup = months[0].month
+
+    if year_lookup and month_lookup and (day_lookup or month_keyed):
+        day = datetime.date(int(year_lookup), int(month_lookup), int(day_lookup or 1))
+        if month_keyed:
+            back = {"link": link({year_field: year_lookup}), "title": str(year_lookup)}
+            title = capfirst(formats.date_format(day, "YEAR_MONTH_FORMAT"))
+        else:
+            back = {
+                "link": link({year_field: year_lookup, month_field: month_lookup}),
+                "title": capfirst(formats.date_format(day, "YEAR_MONTH_FORMAT")),
+            }
+            title = capfirst(formats.date_format(day, "MONTH_DAY_FORMAT"))
+        return {"show": True, "back": back, "choices": [{"title": title}]}
+    elif year_lookup and month_lookup:
+        return {
+            "show": True,
+            "back": {"link": link({year_field: year_lookup}), "title": str(year_lookup)},
+            "choices": [
+                {
+                    "link": link({
+                        year_field: year_lookup, month_field: month_lookup, day_field: day.day,
+                    }),
+                    "title": capfirst(formats.date_format(day, "MONTH_DAY_FORMAT")),
+                }
+                for day in hierarchy.days(int(year_lookup), int(month_lookup), start, stop)
+            ],
+        }
+    elif year_lookup:
+        return {
+            "show": True,
+            "back": {"link": link({}), "title": _("All dates")},
+            "choices": [
+                {
+                    "link": link({year_field: year_lookup, month_field: month.month}),
+                    "title": capfirst(formats.date_format(month, "YEAR_MONTH_FORMAT")),
+                }
+                for month in hierarchy.months(int(year_lookup), start, stop)
+            ],
+        }
+    return {
+        "show": True,
+        "back": None,
+        "choices": [
+            {"link": link({year_field: str(year)}), "title": str(year)}
+            for year in hierarchy.years(start, stop)
+        ],
+    }
+
+
 @register.filter
 def ordered_columns(list_: list, n: int) -> List[list]:
     """Sort in one list (used in Toponomikon Index)."""
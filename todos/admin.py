@@ -1,21 +1,27 @@
 import datetime
-from statistics import mean
+import re
+from collections import defaultdict
+from functools import cache
 
 from django import forms
-from django.apps import apps
 from django.conf import settings
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.admin.sites import AlreadyRegistered
-from django.db import models
-from django.urls import reverse
+from django.contrib.admin.views.main import SEARCH_VAR
+from django.core.exceptions import PermissionDenied
+from django.db import models, transaction
+from django.forms.utils import ErrorDict
+from django.http import HttpResponseRedirect
+from django.urls import path, reverse
 from django.utils.html import format_html
 from django.utils.http import urlencode
-from django.utils.safestring import SafeString, mark_safe
+from django.utils.safestring import SafeString
 
-from todos.admin_utils import (
-    a_monthly, compl_daily, compl_monthly, format_a, format_compl,
-)
-from todos.models import Year, Month, Day, Food
+from todos import changelist_cache, eras, rollups, scores, search, snapshots, streaks, views
+from todos.admin_utils import MOOD_BANDS, format_a, format_compl, format_res
+from todos.models import Year, Month, Day, Food, HabitStreak
+from todos.pagination import KeysetPaginationMixin, hierarchy_range
+from todos.query_budget import QueryBudget
 
 
 
@@ -24,70 +30,153 @@ class YearAdmin(admin.ModelAdmin):
     formfield_overrides = {
         models.TextField: {'widget': forms.Textarea(attrs={'rows': 3, 'cols': 50})},
     }
-    list_display = ['yeardate', 'comments']
+    list_display = ['yeardate', 'completion', 'noA', 'closed', 'comments']
     list_editable = ['comments']
+    actions = ['close_years', 'reopen_years']
+    query_budget = QueryBudget(max_queries=5, max_ms=200)
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        qs = qs.select_related('stats')
+        qs = qs.with_completion()
+        return qs
+
+    @admin.display(ordering='completion_pct')
+    def completion(self, obj):
+        if obj.completion_pct is not None:
+            return format_compl(obj.completion_pct)
+
+    @admin.display(ordering='stats__noA_sum')
+    def noA(self, obj):
+        if hasattr(obj, 'stats') and obj.stats.days:
+            return format_a(obj.stats.noA)
+
+    @admin.action(description="Close selected years (freeze their TODO lists)")
+    def close_years(self, request, queryset):
+        this_year = datetime.date.today().year
+        years = [year for year in queryset.values_list('yeardate', flat=True) if year < this_year]
+        if len(years) < queryset.count():
+            self.message_user(request, f"{this_year} and later can't be closed.", messages.WARNING)
+        if years:
+            days = snapshots.close(request, years)
+            self.message_user(request, f"Closed {', '.join(map(str, years))}: {days} days frozen.")
+
+    @admin.action(description="Reopen selected years")
+    def reopen_years(self, request, queryset):
+        years = list(queryset.values_list('yeardate', flat=True))
+        snapshots.reopen(years)
+        self.message_user(request, f"Reopened {', '.join(map(str, years))}.")
 
 
 
 @admin.register(Day)
-class DayAdmin(admin.ModelAdmin):
+class DayAdmin(KeysetPaginationMixin, admin.ModelAdmin):
     date_hierarchy = 'daydate'
     formfield_overrides = {
         models.TextField: {'widget': forms.Textarea(attrs={'rows': 3, 'cols': 50})},
     }
     list_display = ['daydate', 'month', 'dreams', 'events', 'ideas']
     list_editable = ['dreams', 'events', 'ideas']
+    list_select_related = ['month']
+    query_budget = QueryBudget(max_queries=5, max_ms=200)
+    # Without a full-text index (todos.search) the admin's icontains search
+    search_fields = ['dreams', 'events', 'ideas', 'todolist__comments']
+
+    def _search_term(self, request) -> str:
+        return request.GET.get(SEARCH_VAR, '').strip() if search.available() else ''
+
+    def get_queryset(self, request):
+        if self._search_term(request):
+            # Sorted by rank: get_ordering() refers to the search annotations
+            return self.model._default_manager.get_queryset()
+        return super().get_queryset(request)
+
+    def get_search_results(self, request, queryset, search_term):
+        if self._search_term(request):
+            return search.search(queryset, search_term.strip()), False
+        return super().get_search_results(request, queryset, search_term)
+
+    def get_ordering(self, request):
+        if self._search_term(request):
+            return ['-search_rank', '-daydate']
+        return super().get_ordering(request)
+
+    def get_list_display(self, request):
+        if self._search_term(request):
+            return ['daydate', 'snippet', *self.list_display[1:]]
+        return super().get_list_display(request)
+
+    @admin.display(description="Found", ordering='search_rank')
+    def snippet(self, obj) -> SafeString:
+        return search.highlight(obj.search_snippet)
 
 
 @admin.register(Month)
 class MonthAdmin(admin.ModelAdmin):
-    date_hierarchy = 'days__daydate'
+    date_hierarchy = 'monthdate'
     formfield_overrides = {
         models.TextField: {'widget': forms.Textarea(attrs={'rows': 3, 'cols': 50})},
     }
-    list_display = ['monthdate', 'show_todos', 'completion', 'noA', 'comments']
+    list_display = ['show_month', 'show_todos', 'completion', 'noA', 'comments']
     list_editable = ['comments']
+    # One more on a changelist cache miss: the Month version stamp
+    query_budget = QueryBudget(max_queries=6, max_ms=200)
+
+    def get_changelist(self, request, **kwargs):
+        return changelist_cache.CachedChangeList
+
+    def changelist_cache_range(self, request):
+        return None, None
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        qs = qs.prefetch_related('days__todolist')
-        qs = qs.select_related('year')
+        qs = qs.select_related('year', 'stats')
+        qs = qs.with_completion()
         return qs
 
-    @admin.display
+    def changelist_view(self, request, extra_context=None):
+        # The date hierarchy used to go through days__daydate: keep old links working
+        legacy = 'days__daydate__'
+        if any(param.startswith(legacy) for param in request.GET):
+            params = request.GET.copy()
+            for param in list(params):
+                if param.startswith(legacy):
+                    params.setlist(
+                        param.replace(legacy, 'monthdate__', 1), params.pop(param))
+            return HttpResponseRedirect(f"{request.path}?{params.urlencode()}")
+        return super().changelist_view(request, extra_context)
+
+    def get_object(self, request, object_id, from_field=None):
+        # Months used to be keyed "YYYY-MM": keep the old change URLs working
+        if from_field is None and re.fullmatch(r"\d{4}-\d{2}", object_id or ""):
+            object_id = f"{object_id}-01"
+        return super().get_object(request, object_id, from_field)
+
+    @admin.display(description="month", ordering='monthdate')
+    def show_month(self, obj):
+        return str(obj)
+
+    @admin.display(ordering='completion_pct')
     def completion(self, obj):
-        try:
-            return format_compl(compl_monthly(obj))
-        except ZeroDivisionError:
-            pass
+        if obj.completion_pct is not None:
+            return format_compl(obj.completion_pct)
 
-    @admin.display
+    @admin.display(ordering='stats__noA_sum')
     def noA(self, obj):
-        try:
-            return format_a(a_monthly(obj))
-        except ZeroDivisionError:
-            pass
+        if hasattr(obj, 'stats') and obj.stats.days:
+            return format_a(obj.stats.noA)
 
     @admin.display(description="TODO List")
     def show_todos(self, obj):
-        year, month = obj.monthdate.split('-')
-        year, month = int(year), int(month)
-
-        if year == 2016:
-            affix = "2016end"
-        elif year == 2017 and month in [1, 2, 3, 4, 5, 6, 7]:
-            affix = "2017janjul"
-        elif year == 2017 and month in [8, 9, 10, 11, 12]:
-            affix = "2017augdec"
-        else:
-            affix = year
-
+        era = eras.for_date(obj.monthdate)
+        if era is None:
+            return None
         url = (
-            reverse(f"admin:todos_todolist{affix}_changelist")
+            era.changelist_url
             + "?"
-            + urlencode({f"date__daydate__month": month})
+            + urlencode({f"date__daydate__month": obj.monthdate.month})
             + "&"
-            + urlencode({f"date__daydate__year": year})
+            + urlencode({f"date__daydate__year": obj.monthdate.year})
         )
         html = '<a href="{}" style="border: 1px solid; padding: 2px 3px;" target="_blank">Month TODOs</a>'
         return format_html(html, url)
@@ -96,9 +185,60 @@ class MonthAdmin(admin.ModelAdmin):
 # ----------------------------------------------------
 
 
-class TODOListAdmin(admin.ModelAdmin):
+class CompletionListFilter(admin.SimpleListFilter):
+    title = "completion"
+    parameter_name = 'compl_below'
+
+    def lookups(self, request, model_admin):
+        return [(str(pct), f"< {pct} %") for pct in (25, 50, 75, 100)]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(completion_pct__lt=int(self.value()))
+        return queryset
+
+
+class MoodBandListFilter(admin.SimpleListFilter):
+    title = "res"
+    parameter_name = 'res_band'
+
+    def lookups(self, request, model_admin):
+        return [(color, color) for color, _, _ in MOOD_BANDS]
+
+    def queryset(self, request, queryset):
+        for color, lower, upper in MOOD_BANDS:
+            if self.value() == color:
+                if lower is not None:
+                    queryset = queryset.filter(balance__gte=lower)
+                if upper is not None:
+                    queryset = queryset.filter(balance__lt=upper)
+        return queryset
+
+
+class ChangedRowsOnlyForm(forms.ModelForm):
+    """Changelist row form that skips validation of untouched rows."""
+
+    def full_clean(self):
+        if self.is_bound and not self.has_changed():
+            self._errors = ErrorDict()
+            self.cleaned_data = {}
+            return
+        super().full_clean()
+
+
+@cache
+def day_changelist_url() -> str:
+    return reverse("admin:todos_day_changelist")
+
+
+class TODOListAdmin(KeysetPaginationMixin, admin.ModelAdmin):
     """An abstract ModelAdmin that serves as template via subclassing."""
     date_hierarchy = 'date__daydate'
+    list_filter = [CompletionListFilter, MoodBandListFilter]
+    # The row's date is its key: the era columns only, no Day/Month/Year join
+    list_select_related = ()
+    # One more on a changelist cache miss: the Month version stamp
+    query_budget = QueryBudget(max_queries=7, max_ms=200)
     formfield_overrides = {
         models.PositiveSmallIntegerField: {'widget': forms.NumberInput(attrs={'style': 'width:35px'})},
         models.DecimalField: {'widget': forms.NumberInput(attrs={'style': 'width:55px'})},
@@ -117,7 +257,7 @@ class TODOListAdmin(admin.ModelAdmin):
             *model.INFO_FIELDS,
         ]
         self.list_display = [
-            'date',
+            'show_date',
             'go_to_day',
             *model.TODO_FIELDS,
             *model.INFO_FIELDS,
@@ -126,37 +266,138 @@ class TODOListAdmin(admin.ModelAdmin):
         ]
         super().__init__(model, admin_site)
 
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        qs = qs.with_completion()
+        qs = qs.with_mood_balance()
+        return qs
+
+    def get_changelist(self, request, **kwargs):
+        return snapshots.SnapshotChangeList
+
+    def changelist_cache_range(self, request):
+        return self.model.START, self.model.END
+
+    def has_change_permission(self, request, obj=None):
+        # Closed years are frozen (todos.snapshots)
+        if obj is not None and snapshots.is_closed(obj.date_id):
+            return False
+        return super().has_change_permission(request, obj)
+
+    def has_delete_permission(self, request, obj=None):
+        if obj is not None and snapshots.is_closed(obj.date_id):
+            return False
+        return super().has_delete_permission(request, obj)
+
+    def get_keyset_counts(self, request, cl):
+        # Only the date hierarchy narrows the era: count from the month rollups
+        hierarchy_params = {f"{cl.date_hierarchy}__{part}" for part in ('year', 'month', 'day')}
+        if cl.query or not set(cl.get_filters_params()) <= hierarchy_params:
+            return super().get_keyset_counts(request, cl)
+        era_start, era_end = self.model.START, self.model.END
+        start, stop = hierarchy_range(cl)
+        if start is None:
+            total = rollups.todolist_count(era_start, era_end)
+            return total, total
+        start, stop = max(start, era_start or start), min(stop, era_end or stop)
+        return (rollups.todolist_count(start, stop) if start < stop else 0), None
+
+    def get_form(self, request, obj=None, **kwargs):
+        # Changelist headers get the same labels in the change_list.html template
+        kwargs['labels'] = {**self.model.FIELD_LABELS, **(kwargs.get('labels') or {})}
+        return super().get_form(request, obj, **kwargs)
+
+    @property
+    def media(self):
+        media = super().media
+        if self.list_editable:
+            media += forms.Media(js=[f'{settings.STATIC_URL}js/todos_cell.js'])
+        return media
+
+    def get_urls(self):
+        opts = self.model._meta
+        urls = [
+            path(
+                'cell/',
+                self.admin_site.admin_view(self.cell_view),
+                name=f'{opts.app_label}_{opts.model_name}_cell',
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def cell_view(self, request):
+        """Single-cell JSON save used by the changelist (js/todos_cell.js)."""
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+        return views.todolist_cell(request, self.model)
+
+    # -------------------------------------------------------------------------
+    # list_editable: changed rows are collected by save_model() and written
+    # together - one bulk_update() per set of changed columns - at the end of
+    # the changelist POST, inside one transaction.
+
+    def get_changelist_form(self, request, **kwargs):
+        kwargs.setdefault('form', ChangedRowsOnlyForm)
+        return super().get_changelist_form(request, **kwargs)
+
+    def changelist_view(self, request, extra_context=None):
+        if not (request.method == 'POST' and '_save' in request.POST and self.list_editable):
+            extra_context = {'habit_streaks': streaks.for_model(self.model), **(extra_context or {})}
+            return super().changelist_view(request, extra_context)
+
+        request.todolist_batch = []
+        with transaction.atomic():
+            response = super().changelist_view(request, extra_context)
+            self.save_batch(request.todolist_batch)
+        return response
+
+    def save_model(self, request, obj, form, change):
+        batch = getattr(request, 'todolist_batch', None)
+        if batch is None or not change:
+            return super().save_model(request, obj, form, change)
+        batch.append((obj, form.changed_data))
+
+    def save_batch(self, batch) -> None:
+        if not batch:
+            return
+        with transaction.atomic():
+            # Locked, in key order: concurrent saves of these days wait for
+            # this one, like TODOList.save()
+            saved = list(self.model.objects.select_for_update().filter(
+                pk__in=[obj.pk for obj, _ in batch]).order_by('pk'))
+
+            by_columns = defaultdict(list)
+            for obj, changed_data in batch:
+                scores.update_scores(obj)
+                by_columns[tuple(sorted(changed_data))].append(obj)
+            for columns, objs in by_columns.items():
+                self.model.objects.bulk_update(objs, [*columns, *scores.SCORE_FIELDS])
+            changelist_cache.bump(obj.pk for obj, _ in batch)
+            search.index_days(obj.pk for obj, changed_data in batch if 'comments' in changed_data)
+
+            rollups.apply(rollups.contributions(saved), rollups.contributions(obj for obj, _ in batch))
+            streaks.apply(streaks.done(saved), streaks.done(obj for obj, _ in batch))
+
+    @admin.display(ordering='balance')
     def res(self, obj) -> str:
-        try:
-            sum_plus = mean([obj.awareness, obj.happiness, obj.openness, obj.focus])
-            sum_minus = mean([obj.anger, obj.fear, obj.emptiness, obj.chaos])
-            res = sum_plus - sum_minus
-
-            if res < 1.1:
-                color = "red"
-            elif res < 2.1:
-                color = "gold"
-            elif res < 3.1:
-                color = "deepskyblue"
-            elif res < 4.1:
-                color = "blueviolet"
-            else:
-                color = "white"
-
-            return mark_safe(f'<span style="color: {color}"><b>{res}</b></span>')
-
-        except TypeError:
+        if obj.balance is None:
             return "-"
+        return format_res(obj.balance)
 
+    @admin.display(ordering='completion_pct')
     def compl(self, obj) -> SafeString:
-        return format_compl(compl_daily(obj))
+        return format_compl(obj.completion_pct)
+
+    @admin.display(description="date", ordering='date_id')
+    def show_date(self, obj):
+        return str(obj.date_id)
 
     @admin.display(description="Go To Day")
     def go_to_day(self, obj):
         url = (
-            reverse("admin:todos_day_changelist")
+            day_changelist_url()
             + "?"
-            + urlencode({"todolist__date": f"{obj.date}"})
+            + urlencode({"todolist__date": f"{obj.date_id}"})
         )
         html = '<a href="{}" style="border: 1px solid; padding: 2px 3px;" target="_blank">GO</a>'
         return format_html(html, url)
@@ -169,19 +410,19 @@ Add 'list_editable' attribute only in the current year's TODOList.
 This ensures that by simply creating another a proxy models for the 'new' year
 will be enough to start using it.
 """
-app_models = apps.get_app_config('todos').get_models()
-for TODOModel in filter(lambda a: 'TODO' in str(a) and a._meta.proxy, app_models):
+current_era = eras.for_date(datetime.date.today())
+for era in eras.all_eras():
     try:
         class_dict = {}
-        if str(datetime.date.today().year) in str(TODOModel):
+        if era is current_era:
             class_dict = {
                 'list_editable': [
-                    *TODOModel.TODO_FIELDS,
-                    *TODOModel.INFO_FIELDS,
+                    *era.model.TODO_FIELDS,
+                    *era.model.INFO_FIELDS,
                 ]
             }
-        admin_cls = type(f'{TODOModel.__name__}Admin', (TODOListAdmin,), class_dict)
-        admin.site.register(TODOModel, admin_cls)
+        admin_cls = type(f'{era.model.__name__}Admin', (TODOListAdmin,), class_dict)
+        admin.site.register(era.model, admin_cls)
     except AlreadyRegistered:
         pass
 
@@ -233,8 +474,36 @@ for TODOModel in filter(lambda a: 'TODO' in str(a) and a._meta.proxy, app_models
 # ----------------------------------------------------
 
 
+@admin.register(HabitStreak)
+class HabitStreakAdmin(admin.ModelAdmin):
+    """Per-habit summary; the rows are maintained by todos.streaks."""
+    list_display = [
+        'show_habit', 'current', 'current_start', 'longest', 'longest_start', 'longest_end',
+        'last_day',
+    ]
+    query_budget = QueryBudget(max_queries=5, max_ms=200)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="Habit", ordering='habit')
+    def show_habit(self, obj):
+        label = streaks.label(obj.habit)
+        return label if label == obj.habit else f"{label} ({obj.habit})"
+
+
+# ----------------------------------------------------
+
+
 @admin.register(Food)
 class FoodAdmin(admin.ModelAdmin):
     list_display = ['id', 'name', 'fat', 'protein', 'carbs', 'fiber']
     list_editable = ['name', 'fat', 'protein', 'carbs', 'fiber']
     list_per_page = 1000
+    query_budget = QueryBudget(max_queries=5, max_ms=200)
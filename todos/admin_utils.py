@@ -1,68 +1,62 @@
+from decimal import Decimal
 from functools import cache
-from typing import List
+from typing import Optional
 
-from django.apps import apps
 from django.utils.html import format_html
 from django.utils.safestring import SafeString
 
-from todos.models import TODOList, Month, Day
+from todos import eras
+from todos.models import MARKS_MINUS, MARKS_PLUS, TODOList, Month, Day
+from todos.rules import round_half_even
 
 
 def get_model_by_date(obj: TODOList):
-    year = str(obj.date).split('-')[0]
-    for model in apps.get_app_config('todos').get_models():
-        if year in model.__name__:
-            return model
+    era = eras.for_date(obj.date_id)
+    if era is not None:
+        return era.model
 
 
-def compl_daily(obj: TODOList) -> int:
+def calc_compl_daily(obj: TODOList) -> int:
     model = get_model_by_date(obj)
+    if model is None:
+        return 0
+    return model.RULES.percent(obj)
 
-    def value(field_name: str) -> List[str]:
-        return getattr(obj, field_name)
 
-    def istrue_cnt() -> int:
-        return sum(
-            value(f) is True for f in model.CONDITIONS['TRUE']
-        )
+def compl_daily(obj: TODOList) -> int:
+    if obj.completion is not None:
+        return obj.completion
+    return calc_compl_daily(obj)
 
-    def iszero_cnt() -> int:
-        return sum(
-            value(f) == 0 for f in model.CONDITIONS['ZERO']
-        )
 
-    def ismin_cnt() -> int:
-        return sum(
-            value(k) >= v for k, v in
-            model.CONDITIONS['MINIMUM'].items()
-        )
+def calc_mood_balance(obj: TODOList) -> Optional[Decimal]:
+    """Mean of the positive marks minus mean of the negative ones."""
+    plus = [getattr(obj, mark) for mark in MARKS_PLUS]
+    minus = [getattr(obj, mark) for mark in MARKS_MINUS]
+    if None in plus or None in minus:
+        return None
+    return Decimal(sum(plus) - sum(minus)) / 4
 
-    def isnonempty_cnt() -> int:
-        return sum(
-            value(f) != "" for f in
-            model.CONDITIONS['NONEMPTYSTR']
-        )
 
-    def isoneof_cnt() -> int:
-        return 1 if sum(1 for f in model.CONDITIONS['ONEOF'] if value(f) != "") > 0 else 0
+def mood_balance(obj: TODOList) -> Optional[Decimal]:
+    if obj.mood_balance is not None:
+        return obj.mood_balance
+    return calc_mood_balance(obj)
 
-    # # print(obj.daydate)
 
-    try:
-        sum_completed = istrue_cnt() + iszero_cnt() + ismin_cnt() + isnonempty_cnt() + isoneof_cnt()
-        sum_todo = sum(len(v) for k, v in model.CONDITIONS.items() if k != 'ONEOF')
-        if obj.date.daydate.year in [2021, 2022]:
-            # Add 1 for 'ONEOF' conditions in years 2021 and 2022
-            sum_todo += 1
-        # print(obj, sum_completed, sum_todo)
-        return int(round(sum_completed / sum_todo * 100, 0))
-    except AttributeError:
-        return 0
-    # except TypeError:
-    #     return 0
+# -----------------------------------------------------------------------------
 
 
-# -----------------------------------------------------------------------------
+@cache
+def monthly_fields() -> tuple:
+    """
+    TODOList columns compl_monthly() and a_monthly() read - for
+    Month.objects.with_todolists(fields=monthly_fields()).
+    """
+    fields = {'completion', 'noA'}
+    for era in eras.all_eras():
+        fields.update(era.model.RULES.fields)
+    return tuple(sorted(fields))
 
 
 def _month_todolists(obj: Month) -> list[TODOList]:
@@ -72,7 +66,8 @@ def _month_todolists(obj: Month) -> list[TODOList]:
 def compl_monthly(obj: Month) -> int:
     sum_total = sum(compl_daily(todolist) for todolist in _month_todolists(obj))
     num_days = obj.days.count()
-    return int(round(sum_total / num_days))
+    # Like MonthQuerySet.with_completion()
+    return round_half_even(sum_total, num_days)
 
 
 def a_monthly(obj: Month) -> int:
@@ -116,6 +111,30 @@ def format_compl(value: int) -> SafeString:
         f'<b style="color: {get_color(value, DOS_COLOR_RANGES)}">{value} %</b>')
 
 
+MOOD_BANDS = [
+    # (color, lower bound, upper bound) of mood balance values
+    ("red", None, Decimal('1.1')),
+    ("gold", Decimal('1.1'), Decimal('2.1')),
+    ("deepskyblue", Decimal('2.1'), Decimal('3.1')),
+    ("blueviolet", Decimal('3.1'), Decimal('4.1')),
+    ("white", Decimal('4.1'), None),
+]
+
+
+def mood_color(value: Decimal) -> str:
+    for color, lower, upper in MOOD_BANDS:
+        if (lower is None or value >= lower) and (upper is None or value < upper):
+            return color
+
+
+@cache
+def format_res(value: Decimal) -> SafeString:
+    # Balances are multiples of 0.25, so only a few dozen strings get cached
+    return format_html(
+        '<span style="color: {}"><b>{}</b></span>',
+        mood_color(value), format(value.normalize(), 'f'))
+
+
 @cache
 def format_a(value: int) -> SafeString:
     return format_html(
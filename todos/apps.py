@@ -4,3 +4,35 @@ from django.apps import AppConfig
 class TodosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'todos'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from todos import changelist_cache, eras, hierarchy, search
+        from todos.models import Day, Month, TODOList, Year
+        from todos.rules import CompletionRules
+
+        # Compile each era's CONDITIONS once instead of on every compl_daily()
+        for model in self.get_models():
+            if issubclass(model, TODOList):
+                model.RULES = CompletionRules(model.CONDITIONS)
+
+        # Admin autodiscovery may have built it already
+        eras.get_index()
+
+        # Date hierarchy buckets follow the calendar tables, in every process
+        for model in (Year, Month):
+            post_save.connect(hierarchy.changed, sender=model)
+            post_delete.connect(hierarchy.changed, sender=model)
+        post_delete.connect(hierarchy.changed, sender=Day)
+
+        # Journal text goes to the full-text index (proxies send their own signals)
+        todolist_models = [model for model in self.get_models() if issubclass(model, TODOList)]
+        for model in (Day, *todolist_models):
+            post_save.connect(search.index_instance, sender=model)
+            post_delete.connect(search.index_instance, sender=model)
+
+        # Cached changelists are keyed by the versions of their months
+        for model in (Month, Day, *todolist_models):
+            post_save.connect(changelist_cache.bump_instance, sender=model)
+            post_delete.connect(changelist_cache.bump_instance, sender=model)
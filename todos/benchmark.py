@@ -0,0 +1,214 @@
+"""
+Admin benchmark scenarios, run by the 'benchmark_admin' command.
+
+Every scenario is a callable that does one piece of work the admin does.
+measure() runs it a few times and reports the wall time and the SQL
+queries it took. The command runs all scenarios against synthetic history
+(todos.synthetic) in a test database.
+"""
+import itertools
+import statistics
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, connection
+from django.db.models import Count, QuerySet
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from todos import eras
+from todos.admin_utils import compl_daily, compl_monthly, monthly_fields
+from todos.models import Month, TODOList
+
+
+def measure(fn: Callable[[], object], repeat: int = 3) -> Dict[str, float]:
+    """
+    Time 'fn' and count its queries. If it returns a dict with 'rows' and
+    'bytes' (see scan()), those and the rows per second are reported too.
+    """
+    timings, queries, extra = [], 0, None
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            extra = fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        queries = len(ctx.captured_queries)
+    res = {
+        'queries': queries,
+        'ms_min': round(min(timings), 2),
+        'ms_median': round(statistics.median(timings), 2),
+    }
+    if isinstance(extra, dict):
+        res.update(extra)
+        res['rows_per_s'] = round(extra['rows'] / (res['ms_median'] / 1000 or 1e-9))
+    return res
+
+
+def changelist_url(model) -> str:
+    opts = model._meta
+    return reverse(f"admin:{opts.app_label}_{opts.model_name}_changelist")
+
+
+def staff_client() -> Client:
+    user, _ = get_user_model().objects.get_or_create(
+        username='benchmark', defaults={'is_staff': True, 'is_superuser': True})
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def get(client: Client, url: str) -> Callable[[], object]:
+    def fn():
+        response = client.get(url)
+        assert response.status_code == 200, (url, response.status_code)
+    return fn
+
+
+def toggle_field(model) -> str:
+    return next(
+        name for name in model.TODO_FIELDS
+        if TODOList._meta.get_field(name).get_internal_type() == 'BooleanField')
+
+
+def changelist_post(client: Client, model, rows: int) -> Callable[[], object]:
+    """
+    Submit the editable changelist with one boolean toggled in 'rows' rows.
+
+    The form data is read from the page once; the calls alternate between
+    the toggled and the original values, so each one changes 'rows' rows.
+    """
+    url, field = changelist_url(model), toggle_field(model)
+    formset = client.get(url).context['cl'].formset
+    payloads = []
+    for toggle in (True, False):
+        data = {'_save': "Save"}
+        data.update({
+            f'{formset.prefix}-{key}': value
+            for key, value in formset.management_form.initial.items()})
+        for i, form in enumerate(formset.forms):
+            for name in form.fields:
+                value = form[name].value()
+                if toggle and name == field and i < rows:
+                    value = not value
+                if isinstance(value, bool):
+                    if value:
+                        data[form.add_prefix(name)] = 'on'
+                elif value is not None:
+                    data[form.add_prefix(name)] = getattr(value, 'pk', value)
+        payloads.append(data)
+    payloads = itertools.cycle(payloads)
+
+    def fn():
+        response = client.post(url, next(payloads))
+        assert response.status_code == 302, (url, response.status_code)
+    return fn
+
+
+def cell_patch(client: Client, model) -> Callable[[], object]:
+    """Toggle one boolean cell through the single-cell endpoint."""
+    opts = model._meta
+    url = reverse(f"admin:{opts.app_label}_{opts.model_name}_cell")
+    field = toggle_field(model)
+    obj = model.objects.order_by('-date_id').first()
+    values = itertools.cycle([not getattr(obj, field), getattr(obj, field)])
+
+    def fn():
+        response = client.patch(
+            url, {'date': str(obj.pk), 'field': field, 'value': next(values)},
+            content_type='application/json')
+        assert response.status_code == 200, (url, response.status_code)
+    return fn
+
+
+def scan(querysets: Callable[[], Iterable[QuerySet]]) -> Callable[[], dict]:
+    """
+    Fetch every row of the querysets' SQL. 'bytes' is the size of the
+    fetched values as text - a stand-in for what the database sends.
+    """
+    def fn():
+        rows = size = 0
+        for qs in querysets():
+            sql, params = qs.query.get_compiler(qs.db).as_sql()
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                for row in iter(lambda: cursor.fetchmany(1000), []):
+                    rows += len(row)
+                    size += sum(len(str(value)) for values in row for value in values
+                                if value is not None)
+        return {'rows': rows, 'bytes': size}
+    return fn
+
+
+def month_days_join() -> Callable[[], object]:
+    """Days of every month with completion >= 50 %: Month-Day-TODOList joins."""
+    qs = (Month.objects.filter(days__todolist__completion__gte=50)
+          .values('pk').annotate(days_cnt=Count('days')).order_by())
+    return lambda: list(qs.all())
+
+
+def index_sizes() -> Dict[str, int]:
+    """Bytes of every index of the todos tables (PostgreSQL; SQLite with dbstat)."""
+    with connection.cursor() as cursor:
+        try:
+            if connection.vendor == 'postgresql':
+                cursor.execute(
+                    "SELECT indexrelname, pg_relation_size(indexrelid) "
+                    "FROM pg_stat_user_indexes WHERE relname LIKE 'todos\\_%'")
+            elif connection.vendor == 'sqlite':
+                cursor.execute(
+                    "SELECT name, SUM(pgsize) FROM dbstat WHERE name IN ("
+                    "SELECT name FROM sqlite_master "
+                    "WHERE type = 'index' AND tbl_name LIKE 'todos_%') GROUP BY name")
+            else:
+                return {}
+        except DatabaseError:
+            return {}
+        return dict(cursor.fetchall())
+
+
+def compl_daily_all() -> Callable[[], object]:
+    todolists = list(TODOList.objects.all())
+    return lambda: [compl_daily(obj) for obj in todolists]
+
+
+def compl_monthly_last_year() -> Callable[[], object]:
+    last_year = Month.objects.order_by('-monthdate').values_list('year', flat=True).first()
+    months = list(Month.objects.filter(year=last_year).with_todolists(monthly_fields()))
+    return lambda: [compl_monthly(month) for month in months]
+
+
+def scenarios(client: Client) -> List[Tuple[str, Callable[[], Callable]]]:
+    """(name, setup) pairs; setup() prepares the scenario and returns it."""
+    res = [('month_changelist', lambda: get(client, changelist_url(Month)))]
+    for era in eras.all_eras():
+        res.append((
+            f'changelist:{era.model.__name__}',
+            lambda url=era.changelist_url: get(client, url)))
+    # Column pruning: all eras' rows with the era columns vs. every column
+    res.append(('era_scan:era_columns', lambda: scan(
+        lambda: [era.model.objects.all() for era in eras.all_eras()])))
+    res.append(('era_scan:all_columns', lambda: scan(
+        lambda: [era.model.objects.defer(None) for era in eras.all_eras()])))
+    res.append(('join:month_days', month_days_join))
+    res.append(('compl_daily:all_days', compl_daily_all))
+    res.append(('compl_monthly:last_year', compl_monthly_last_year))
+
+    # Saves go to the last era, made list_editable for the run
+    model = eras.all_eras()[-1].model
+    res.append(('list_editable_post:1_row', lambda: changelist_post(client, model, rows=1)))
+    res.append(('list_editable_post:10_rows', lambda: changelist_post(client, model, rows=10)))
+    res.append(('cell_patch', lambda: cell_patch(client, model)))
+    return res
+
+
+def run(repeat: int = 3) -> Dict[str, Dict[str, float]]:
+    model_admin = admin.site._registry[eras.all_eras()[-1].model]
+    list_editable = model_admin.list_editable
+    model_admin.list_editable = [*model_admin.model.TODO_FIELDS, *model_admin.model.INFO_FIELDS]
+    try:
+        return {name: measure(setup(), repeat) for name, setup in scenarios(staff_client())}
+    finally:
+        model_admin.list_editable = list_editable
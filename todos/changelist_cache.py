@@ -0,0 +1,119 @@
+"""
+Rendered changelist results cached per month version.
+
+Every Month has a version, bumped (with F()) when a TODOList, Day or Month
+row of the month is saved or deleted. A cached changelist fragment - the
+results table and the pagination bar - is keyed by the request and by the
+versions of the months it covers, so a hit is never stale and a past
+month's changelist stays cached until the month changes.
+
+A ModelAdmin opts in with changelist_cache_range(); CachedChangeList (or
+CachedKeysetChangeList) serves the counts from the cache and the
+change_list.html template the fragment.
+"""
+import datetime
+import hashlib
+from typing import Iterable, Optional, Tuple
+
+from django.contrib.admin.views.main import ChangeList
+from django.core.cache import cache
+from django.db.models import Count, F, Sum
+from django.utils import translation
+from django.utils.safestring import mark_safe
+
+from todos.models import Month
+from todos.pagination import KeysetChangeList
+
+
+TIMEOUT = 60 * 60 * 24 * 7
+
+# ChangeList attributes restored on a hit (set by get_results())
+ATTRIBUTES = (
+    'result_count', 'full_result_count', 'show_full_result_count', 'show_admin_actions',
+    'can_show_all', 'multi_page',
+)
+
+
+def _month(date) -> datetime.date:
+    return datetime.date.fromisoformat(str(date)[:10]).replace(day=1)
+
+
+def bump(dates: Iterable) -> None:
+    """New versions for the months of the dates."""
+    months = {_month(date) for date in dates if date is not None}
+    if months:
+        Month.objects.filter(pk__in=months).update(version=F('version') + 1)
+
+
+def bump_all() -> None:
+    Month.objects.update(version=F('version') + 1)
+
+
+def bump_instance(sender, instance, **kwargs) -> None:
+    """post_save/post_delete receiver of TODOList, Day and Month."""
+    bump([instance.pk])
+
+
+def stamp(start: Optional[datetime.date] = None, stop: Optional[datetime.date] = None) -> str:
+    """
+    Version stamp of the months in [start, stop): it changes whenever one
+    of them is bumped (versions only grow), added or deleted.
+    """
+    months = Month.objects.order_by()
+    if start:
+        months = months.filter(monthdate__gte=_month(start))
+    if stop:
+        months = months.filter(monthdate__lt=stop)
+    res = months.aggregate(count=Count('pk'), total=Sum('version'))
+    return f"{res['count']}.{res['total'] or 0}"
+
+
+class CachedChangeListMixin:
+    def cache_key(self, request) -> Optional[str]:
+        if request.method != 'GET':
+            return None
+        bounds: Optional[Tuple] = self.model_admin.changelist_cache_range(request)
+        if bounds is None:
+            return None
+        opts = self.model._meta
+        variant = repr((
+            sorted(request.GET.lists()), self.list_display, self.list_editable,
+            translation.get_language(),
+        ))
+        digest = hashlib.md5(variant.encode()).hexdigest()
+        return f"todos:changelist:{opts.label_lower}:{digest}:{stamp(*bounds)}"
+
+    def get_results(self, request):
+        self.results_cache_key = self.cache_key(request)
+        self.cached_results = None
+        cached = self.results_cache_key and cache.get(self.results_cache_key)
+        if not cached:
+            return super().get_results(request)
+
+        for name in ATTRIBUTES:
+            setattr(self, name, cached[name])
+        self.keyset = None
+        self.paginator = None
+        self.pagination_html = mark_safe(cached['pagination_html'])
+        self.cached_results = mark_safe(cached['results_html'])
+        # Only a list_editable formset reads the rows: the page's, by key
+        self.result_list = self.model._default_manager.filter(pk__in=cached['pks'])
+
+    def store_results(self, results_html: str) -> None:
+        """Called by the template once the fragment is rendered."""
+        if not self.results_cache_key or self.cached_results is not None:
+            return
+        cache.set(self.results_cache_key, {
+            **{name: getattr(self, name) for name in ATTRIBUTES},
+            'pagination_html': str(self.pagination_html),
+            'results_html': results_html,
+            'pks': [obj.pk for obj in self.result_list],
+        }, TIMEOUT)
+
+
+class CachedChangeList(CachedChangeListMixin, ChangeList):
+    pass
+
+
+class CachedKeysetChangeList(CachedChangeListMixin, KeysetChangeList):
+    pass
@@ -0,0 +1,76 @@
+"""
+Date -> TODOList era lookup.
+
+Every era proxy declares the half-open date range [START, END) it covers.
+The sorted index of those ranges is built once (in TodosConfig.ready() or on
+first use, whichever comes first) and answers lookups with a binary search.
+"""
+import datetime
+from bisect import bisect_right
+from functools import cached_property
+from typing import List, Optional
+
+from django.apps import apps
+from django.urls import reverse
+
+
+class Era:
+    def __init__(self, model) -> None:
+        self.model = model
+        self.start: datetime.date = model.START
+        self.end: datetime.date = model.END
+
+    def __repr__(self) -> str:
+        return f"<Era {self.model.__name__} [{self.start}, {self.end})>"
+
+    def __contains__(self, date: datetime.date) -> bool:
+        return self.start <= date < self.end
+
+    @cached_property
+    def changelist_url(self) -> str:
+        opts = self.model._meta
+        return reverse(f"admin:{opts.app_label}_{opts.model_name}_changelist")
+
+
+class EraIndex:
+    def __init__(self, models) -> None:
+        self.eras: List[Era] = sorted(
+            (Era(model) for model in models), key=lambda era: era.start)
+        for prev, era in zip(self.eras, self.eras[1:]):
+            if era.start < prev.end:
+                raise ValueError(f"{era} overlaps {prev}")
+        self._starts = [era.start for era in self.eras]
+
+    def for_date(self, date) -> Optional[Era]:
+        if not isinstance(date, datetime.date):
+            date = datetime.date.fromisoformat(str(date))
+        idx = bisect_right(self._starts, date) - 1
+        if idx >= 0 and date in self.eras[idx]:
+            return self.eras[idx]
+        return None
+
+
+_index: Optional[EraIndex] = None
+
+
+def build() -> EraIndex:
+    global _index
+    from todos.models import TODOList
+
+    _index = EraIndex(
+        model for model in apps.get_app_config('todos').get_models()
+        if issubclass(model, TODOList) and model.START is not None
+    )
+    return _index
+
+
+def get_index() -> EraIndex:
+    return _index or build()
+
+
+def all_eras() -> List[Era]:
+    return get_index().eras
+
+
+def for_date(date) -> Optional[Era]:
+    return get_index().for_date(date)
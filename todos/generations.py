@@ -0,0 +1,81 @@
+"""
+Invalidation of per-process caches across instances, through the database.
+
+A cache registers a generation name and the function that clears it.
+Writes that make the cache stale call bump(): the local cache is cleared at
+once and the generation's CacheGeneration counter incremented in the
+writing transaction. Every process polls the counters - at most once per
+CACHE_GENERATION_POLL_SECONDS, from CacheGenerationMiddleware - and clears
+the caches whose counters moved. Another instance serves a stale cache for
+at most the poll interval.
+
+Caches derived from code only (era index, compiled rules, streak checks,
+formatted values) need no generation; cached changelists are keyed by
+Month versions (todos.changelist_cache) and never go stale.
+"""
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from todos.models import CacheGeneration
+
+
+_clears: Dict[str, List[Callable[[], None]]] = defaultdict(list)
+_seen: Dict[str, int] = {}
+_checked_at = float('-inf')
+
+
+def register(name: str, clear: Callable[[], None]) -> None:
+    """Clear the cache with clear() whenever generation 'name' moves."""
+    _clears[name].append(clear)
+
+
+def _clear(name: str) -> None:
+    for clear in _clears[name]:
+        clear()
+
+
+def clear_all() -> None:
+    """Clear every registered cache in this process (tests)."""
+    for name in _clears:
+        _clear(name)
+
+
+def bump(name: str) -> None:
+    """Invalidate the 'name' caches: here now, elsewhere at their next poll."""
+    _clear(name)
+    with transaction.atomic():
+        if not CacheGeneration.objects.filter(name=name).update(value=F('value') + 1):
+            CacheGeneration.objects.get_or_create(name=name)
+            CacheGeneration.objects.filter(name=name).update(value=F('value') + 1)
+    # A cache refilled before the commit may hold the old rows
+    transaction.on_commit(lambda: _clear(name))
+
+
+def check(force: bool = False) -> None:
+    """Clear the caches whose generations moved since the last check."""
+    global _checked_at
+    now = time.monotonic()
+    if not force and now - _checked_at < getattr(settings, 'CACHE_GENERATION_POLL_SECONDS', 5):
+        return
+    _checked_at = now
+    values = dict(CacheGeneration.objects.filter(name__in=_clears).values_list('name', 'value'))
+    for name in _clears:
+        value = values.get(name, 0)
+        if _seen.get(name) != value:
+            # First check included: a cache filled before it is of unknown age
+            _seen[name] = value
+            _clear(name)
+
+
+class CacheGenerationMiddleware:
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request):
+        check()
+        return self.get_response(request)
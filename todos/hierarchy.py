@@ -0,0 +1,80 @@
+"""
+Year and month buckets of the admin date hierarchies.
+
+They are read from the Year and Month tables instead of a DISTINCT
+date-truncation query on every changelist. The buckets are cached per
+process and dropped whenever a Year or Month row is added or deleted, or
+calendar rows are provisioned - in other processes too, through the
+'calendar' generation (todos.generations).
+"""
+import datetime
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from todos import generations
+from todos.models import Month, Year
+
+
+GENERATION = 'calendar'
+
+_months: Optional[Dict[int, Tuple[datetime.date, ...]]] = None
+
+
+def invalidate(*args, **kwargs) -> None:
+    global _months
+    _months = None
+
+
+generations.register(GENERATION, invalidate)
+
+
+def changed(sender=None, created: bool = True, **kwargs) -> None:
+    """Calendar rows were added or removed: post_save/post_delete receiver."""
+    # An edit of an existing row (comments) leaves the buckets as they are
+    if created:
+        generations.bump(GENERATION)
+
+
+def months_by_year() -> Dict[int, Tuple[datetime.date, ...]]:
+    global _months
+    if _months is None:
+        months = defaultdict(list)
+        for year in Year.objects.order_by('yeardate').values_list('yeardate', flat=True):
+            months.setdefault(year, [])
+        for monthdate in Month.objects.order_by('monthdate').values_list('monthdate', flat=True):
+            months[monthdate.year].append(monthdate)
+        _months = {year: tuple(months[year]) for year in sorted(months)}
+    return _months
+
+
+def _overlaps(first: datetime.date, end: datetime.date, start, stop) -> bool:
+    """Does [first, end) overlap the optional bounds [start, stop)?"""
+    return (start is None or end > start) and (stop is None or first < stop)
+
+
+def years(start: Optional[datetime.date] = None,
+          stop: Optional[datetime.date] = None) -> List[int]:
+    return [
+        year for year in months_by_year()
+        if _overlaps(datetime.date(year, 1, 1), datetime.date(year + 1, 1, 1), start, stop)
+    ]
+
+
+def months(year: int, start: Optional[datetime.date] = None,
+           stop: Optional[datetime.date] = None) -> List[datetime.date]:
+    res = []
+    for month in months_by_year().get(year, ()):
+        end = (month + datetime.timedelta(days=31)).replace(day=1)
+        if _overlaps(month, end, start, stop):
+            res.append(month)
+    return res
+
+
+def days(year: int, month: int, start: Optional[datetime.date] = None,
+         stop: Optional[datetime.date] = None) -> List[datetime.date]:
+    res, day = [], datetime.date(year, month, 1)
+    while day.month == month:
+        if _overlaps(day, day + datetime.timedelta(days=1), start, stop):
+            res.append(day)
+        day += datetime.timedelta(days=1)
+    return res
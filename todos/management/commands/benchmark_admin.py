@@ -0,0 +1,55 @@
+import datetime
+import json
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from todos import benchmark, synthetic
+from todos.models import Day, Food, Month, TODOList, Year
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the admin (changelists, completion helpers, list_editable saves) "
+        "against synthetic history of growing size, in a test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years', type=int, nargs='+', default=[1, 10, 50])
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--output', help="JSON file (default: benchmark-<timestamp>.json)")
+
+    def handle(self, *args, **options):
+        started = datetime.datetime.now()
+        output = options['output'] or f"benchmark-{started:%Y%m%d-%H%M%S}.json"
+        report = {
+            'started': started.isoformat(timespec='seconds'),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'seed': options['seed'],
+            'repeat': options['repeat'],
+            'runs': [],
+        }
+
+        with synthetic.test_database():
+            for years in options['years']:
+                synthetic.clear()
+                synthetic.generate(years, options['seed'])
+                results = benchmark.run(options['repeat'])
+                report['runs'].append({
+                    'years': years,
+                    'rows': {model.__name__: model.objects.count()
+                             for model in (Year, Month, Day, TODOList, Food)},
+                    'index_bytes': benchmark.index_sizes(),
+                    'results': results,
+                })
+                for name, res in results.items():
+                    self.stdout.write(
+                        f"{years:>3} years  {name:<36} {res['queries']:>5} queries  "
+                        f"{res['ms_median']:>9.1f} ms")
+
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Results written to {output}"))
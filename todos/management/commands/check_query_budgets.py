@@ -0,0 +1,56 @@
+import gc
+
+from django.contrib import admin
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+
+from todos import benchmark, generations, synthetic
+from todos.query_budget import DEFAULT_BUDGET, QueryBudgetExceeded
+
+
+class Command(BaseCommand):
+    help = (
+        "Render every registered todos changelist against synthetic history "
+        "in a test database and check it against the admin's query_budget."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years', type=int, default=2)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--time-scale', type=float, default=1.0,
+            help="Multiply the SQL time budgets (slow or shared machines)")
+
+    def handle(self, *args, **options):
+        failures = []
+        with synthetic.test_database():
+            synthetic.generate(options['years'], options['seed'])
+            client = benchmark.staff_client()
+            for model, model_admin in admin.site._registry.items():
+                if model._meta.app_label != 'todos':
+                    continue
+                url = benchmark.changelist_url(model)
+                budget = getattr(model_admin, 'query_budget', DEFAULT_BUDGET)
+                budget = budget.scaled(options['time_scale'], label=f"{url}")
+                # Budgets are for warm per-process caches (eras, date hierarchy)
+                # but a cold changelist cache: a hit would hide the page's queries
+                benchmark.get(client, url)()
+                cache.clear()
+                # Nor the generation poll, which is due at most every few seconds
+                generations.check(force=True)
+                # A full collection landing in a query would count as SQL time
+                gc.collect()
+                try:
+                    with budget:
+                        benchmark.get(client, url)()
+                except QueryBudgetExceeded as exc:
+                    failures.append(str(exc))
+                    self.stdout.write(self.style.ERROR(f"FAIL {url}"))
+                else:
+                    self.stdout.write(
+                        f"ok   {url}  {len(budget.queries)}/{budget.max_queries} queries  "
+                        f"{budget.total_ms:.1f} ms")
+
+        if failures:
+            raise CommandError("\n\n".join(failures))
+        self.stdout.write(self.style.SUCCESS("All changelists are within their query budgets."))
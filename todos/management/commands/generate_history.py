@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from todos.synthetic import generate
+
+
+class Command(BaseCommand):
+    help = "Fill the database with seeded synthetic history (for development and benchmarks)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years', type=int, default=8)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--end-year', type=int, help="Last year to fill (default: the last era's)")
+
+    def handle(self, *args, **options):
+        res = generate(options['years'], options['seed'], options['end_year'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {res['years']} years: {res['todolists']} TODOLists, {res['foods']} Foods."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from todos.provisioning import provision
+
+
+class Command(BaseCommand):
+    help = "Create the Year, Month and Day rows of one or more years in bulk."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, required=True, help="First year, e.g. 2024")
+        parser.add_argument('--to', type=int, help="Last year (default: --year)")
+
+    def handle(self, *args, **options):
+        first, last = options['year'], options['to'] or options['year']
+        if last < first:
+            raise CommandError("--to must not be before --year")
+        years, months, days = provision(first, last)
+        self.stdout.write(self.style.SUCCESS(
+            f"Provisioned {years} years, {months} months and {days} days "
+            f"({first}-{last}); existing rows were kept."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from todos import rollups
+from todos.models import MonthStats, YearStats
+
+
+class Command(BaseCommand):
+    help = "Rebuild MonthStats and YearStats rollups from all TODOLists."
+
+    def handle(self, *args, **options):
+        rollups.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {MonthStats.objects.count()} months "
+            f"and {YearStats.objects.count()} years."))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from todos import search
+from todos.models import JournalIndex
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text index of Day journals and TODOList comments."
+
+    def handle(self, *args, **options):
+        if not search.available():
+            raise CommandError("This database has no full-text index (PostgreSQL or SQLite only).")
+        search.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {JournalIndex.objects.count()} days."))
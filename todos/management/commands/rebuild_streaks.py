@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from todos import streaks
+
+
+class Command(BaseCommand):
+    help = "Rebuild the current and longest streak of every habit from all TODOLists."
+
+    def handle(self, *args, **options):
+        states = streaks.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt the streaks of {len(states)} habits."))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from todos import rollups
+from todos.scores import recompute
+
+
+class Command(BaseCommand):
+    help = "Recompute stored TODOList completion and mood balance, one process per era."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        res = recompute(options['workers'], options['chunk_size'])
+        # Rollups sum the stored completion, so they follow any change
+        rollups.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Recomputed scores of {sum(res)} TODOLists."))
@@ -0,0 +1,77 @@
+import datetime
+import json
+import os
+import re
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# python -X importtime: "import time: <self us> | <cumulative us> | <indented module>"
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+SETUP = (
+    "import time; start = time.perf_counter(); import django; django.setup(); "
+    "print(round((time.perf_counter() - start) * 1000, 1))"
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time django.setup() in a fresh interpreter (python -X importtime) and "
+        "list the slowest imports - settings and their secrets included."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=25)
+        parser.add_argument('--output', help="Also write the report to this JSON file")
+
+    def handle(self, *args, **options):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE}
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', SETUP],
+            capture_output=True, text=True, env=env, cwd=settings.BASE_DIR)
+        imports, errors = [], []
+        for line in proc.stderr.splitlines():
+            match = LINE.match(line)
+            if match:
+                self_us, cumulative_us, indent, module = match.groups()
+                imports.append({
+                    'module': module,
+                    'depth': len(indent) // 2,
+                    'self_ms': int(self_us) / 1000,
+                    'cumulative_ms': int(cumulative_us) / 1000,
+                })
+            elif not line.startswith("import time:"):
+                errors.append(line)
+        if proc.returncode:
+            raise CommandError("\n".join(errors[-20:]) or f"exit status {proc.returncode}")
+
+        report = {
+            'started': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'setup_ms': float(proc.stdout.strip().splitlines()[-1]),
+            'imports_ms': round(sum(i['cumulative_ms'] for i in imports if i['depth'] == 0), 1),
+            'slowest_cumulative': sorted(
+                (i for i in imports if i['depth'] == 0),
+                key=lambda i: i['cumulative_ms'], reverse=True)[:options['limit']],
+            'slowest_self': sorted(
+                imports, key=lambda i: i['self_ms'], reverse=True)[:options['limit']],
+        }
+
+        self.stdout.write(
+            f"django.setup(): {report['setup_ms']:.1f} ms, "
+            f"of which imports {report['imports_ms']:.1f} ms ({len(imports)} modules)")
+        self.stdout.write("\nTop-level imports by cumulative time:")
+        for i in report['slowest_cumulative']:
+            self.stdout.write(f"  {i['cumulative_ms']:>9.1f} ms  {i['module']}")
+        self.stdout.write("\nModules by own time:")
+        for i in report['slowest_self']:
+            self.stdout.write(f"  {i['self_ms']:>9.1f} ms  {i['module']}")
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
@@ -0,0 +1,72 @@
+# Generated by Django 4.1.6 on 2026-10-18 11:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0015_year_alter_day_options_alter_todolist_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthStats',
+            fields=[
+                ('days', models.PositiveIntegerField(default=0)),
+                ('completion_sum', models.PositiveIntegerField(default=0)),
+                ('noA_sum', models.PositiveIntegerField(default=0)),
+                ('noA_cnt', models.PositiveIntegerField(default=0)),
+                ('awareness_sum', models.PositiveIntegerField(default=0)),
+                ('awareness_cnt', models.PositiveIntegerField(default=0)),
+                ('happiness_sum', models.PositiveIntegerField(default=0)),
+                ('happiness_cnt', models.PositiveIntegerField(default=0)),
+                ('openness_sum', models.PositiveIntegerField(default=0)),
+                ('openness_cnt', models.PositiveIntegerField(default=0)),
+                ('focus_sum', models.PositiveIntegerField(default=0)),
+                ('focus_cnt', models.PositiveIntegerField(default=0)),
+                ('anger_sum', models.PositiveIntegerField(default=0)),
+                ('anger_cnt', models.PositiveIntegerField(default=0)),
+                ('fear_sum', models.PositiveIntegerField(default=0)),
+                ('fear_cnt', models.PositiveIntegerField(default=0)),
+                ('emptiness_sum', models.PositiveIntegerField(default=0)),
+                ('emptiness_cnt', models.PositiveIntegerField(default=0)),
+                ('chaos_sum', models.PositiveIntegerField(default=0)),
+                ('chaos_cnt', models.PositiveIntegerField(default=0)),
+                ('month', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='todos.month')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='YearStats',
+            fields=[
+                ('days', models.PositiveIntegerField(default=0)),
+                ('completion_sum', models.PositiveIntegerField(default=0)),
+                ('noA_sum', models.PositiveIntegerField(default=0)),
+                ('noA_cnt', models.PositiveIntegerField(default=0)),
+                ('awareness_sum', models.PositiveIntegerField(default=0)),
+                ('awareness_cnt', models.PositiveIntegerField(default=0)),
+                ('happiness_sum', models.PositiveIntegerField(default=0)),
+                ('happiness_cnt', models.PositiveIntegerField(default=0)),
+                ('openness_sum', models.PositiveIntegerField(default=0)),
+                ('openness_cnt', models.PositiveIntegerField(default=0)),
+                ('focus_sum', models.PositiveIntegerField(default=0)),
+                ('focus_cnt', models.PositiveIntegerField(default=0)),
+                ('anger_sum', models.PositiveIntegerField(default=0)),
+                ('anger_cnt', models.PositiveIntegerField(default=0)),
+                ('fear_sum', models.PositiveIntegerField(default=0)),
+                ('fear_cnt', models.PositiveIntegerField(default=0)),
+                ('emptiness_sum', models.PositiveIntegerField(default=0)),
+                ('emptiness_cnt', models.PositiveIntegerField(default=0)),
+                ('chaos_sum', models.PositiveIntegerField(default=0)),
+                ('chaos_cnt', models.PositiveIntegerField(default=0)),
+                ('year', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='todos.year')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.1.6 on 2026-10-18 11:29
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0016_monthstats_yearstats'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='todolist',
+            options={'ordering': ['-date_id']},
+        ),
+        migrations.AlterModelOptions(
+            name='todolist2023',
+            options={'ordering': ['-date_id'], 'verbose_name': 'TODO 2023', 'verbose_name_plural': 'TODOs 2023'},
+        ),
+    ]
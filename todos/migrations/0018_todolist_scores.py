@@ -0,0 +1,23 @@
+# Generated by Django 4.1.6 on 2026-10-18 11:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0017_todolist_ordering_date_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='todolist',
+            name='completion',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='todolist',
+            name='mood_balance',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=4, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Month keys "YYYY-MM" become "YYYY-MM-01", ready to be cast to a date by
+# 0020. Kept in its own migration (own transaction): on PostgreSQL, ALTER
+# TABLE can't follow updates with pending deferred FK checks.
+
+from django.db import migrations
+
+
+FORWARD = [
+    "UPDATE todos_month SET monthdate = monthdate || '-01' WHERE length(monthdate) = 7",
+    "UPDATE todos_day SET month_id = month_id || '-01' WHERE length(month_id) = 7",
+    "UPDATE todos_monthstats SET month_id = month_id || '-01' WHERE length(month_id) = 7",
+]
+BACKWARD = [
+    "UPDATE todos_month SET monthdate = substr(monthdate, 1, 7)",
+    "UPDATE todos_day SET month_id = substr(month_id, 1, 7)",
+    "UPDATE todos_monthstats SET month_id = substr(month_id, 1, 7)",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0018_todolist_scores'),
+    ]
+
+    operations = [
+        migrations.RunSQL(FORWARD, BACKWARD),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.1.6 on 2026-10-18 11:56
+
+from django.db import migrations, models
+import todos.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0019_month_keys_first_of_month'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='month',
+            name='monthdate',
+            field=models.DateField(default=todos.models.monthdate, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='year',
+            name='yeardate',
+            field=models.PositiveSmallIntegerField(default=todos.models.yeardate, primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# The full-text index of the journal (todos.search): a tsvector table with a
+# GIN index on PostgreSQL, an FTS5 table on SQLite, filled from the current
+# rows. JournalIndex maps it read-only (unmanaged) for the admin's joins.
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from todos import search
+
+
+def create(apps, schema_editor):
+    search.create(schema_editor)
+
+
+def drop(apps, schema_editor):
+    search.drop(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0020_compact_year_month_keys'),
+    ]
+
+    operations = [
+        migrations.RunPython(create, drop),
+        migrations.CreateModel(
+            name='JournalIndex',
+            fields=[
+                ('day', models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='journal', serialize=False, to='todos.day')),
+                ('document', models.TextField()),
+            ],
+            options={
+                'db_table': 'todos_journalindex',
+                'managed': False,
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.1.6 on 2026-10-18 12:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0021_journal_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HabitStreak',
+            fields=[
+                ('habit', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('last_day', models.DateField(blank=True, null=True)),
+                ('current', models.PositiveIntegerField(default=0)),
+                ('current_start', models.DateField(blank=True, null=True)),
+                ('longest', models.PositiveIntegerField(default=0)),
+                ('longest_start', models.DateField(blank=True, null=True)),
+                ('longest_end', models.DateField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-current', '-longest'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.1.6 on 2026-10-18 12:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0022_habitstreak'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='month',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
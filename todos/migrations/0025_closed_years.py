@@ -0,0 +1,32 @@
+# Generated by Django 4.1.6 on 2026-10-18 12:34
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0024_cache_generation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='year',
+            name='closed',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.CreateModel(
+            name='DaySnapshot',
+            fields=[
+                ('date', models.DateField(primary_key=True, serialize=False)),
+                ('completion_pct', models.PositiveSmallIntegerField(null=True)),
+                ('balance', models.DecimalField(decimal_places=2, max_digits=4, null=True)),
+                ('cells', models.TextField()),
+                ('year', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='todos.year')),
+            ],
+            options={
+                'ordering': ['-date'],
+            },
+        ),
+    ]
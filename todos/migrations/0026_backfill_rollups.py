@@ -0,0 +1,49 @@
+# MonthStats and YearStats (0016) of the existing TODOLists, summed in SQL
+# from the stored scores. Days without a stored completion (before
+# 'manage.py recompute_scores', which rebuilds the rollups too) count as 0.
+
+from django.db import migrations
+from django.db.models import Count, F, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def aggregates(stats_model):
+    """The stats columns as aggregates of their TODOList columns."""
+    res = {}
+    for field in stats_model._meta.concrete_fields:
+        name = field.name
+        if name == 'days':
+            res[name] = Count('pk')
+        elif name.endswith('_sum'):
+            source = 'completion' if name == 'completion_sum' else name[:-len('_sum')]
+            res[name] = Coalesce(Sum(source), Value(0))
+        elif name.endswith('_cnt'):
+            res[name] = Count(name[:-len('_cnt')])
+    return res
+
+
+def backfill(apps, schema_editor):
+    TODOList = apps.get_model('todos', 'TODOList')
+    Month = apps.get_model('todos', 'Month')
+    MonthStats = apps.get_model('todos', 'MonthStats')
+    YearStats = apps.get_model('todos', 'YearStats')
+
+    for stats_model, key, fk in ((MonthStats, 'date__month', 'month_id'),
+                                 (YearStats, 'date__month__year', 'year_id')):
+        totals = TODOList.objects.order_by().values(key).annotate(**aggregates(stats_model))
+        stats_model.objects.all().delete()
+        stats_model.objects.bulk_create(
+            stats_model(**{fk: row.pop(key)}, **row) for row in totals)
+    # Cached changelists (todos.changelist_cache) show the old totals
+    Month.objects.update(version=F('version') + 1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0025_closed_years'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
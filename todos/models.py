@@ -1,84 +1,131 @@
 import datetime
+from decimal import Decimal
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.functions import Coalesce, NullIf
+
+from todos.rules import half_even_division
 
 
 # =============================================================================
 
 
 def yeardate():
-    y, _, _ = str(datetime.date.today()).split('-')
-    return str(y)
+    return datetime.date.today().year
 
 
-class YearManager(models.Manager):
-    def get_queryset(self):
-        qs = super().get_queryset()
-        qs = qs.prefetch_related('months') # less queries, but slower (GCP cheaper ?)
-        return qs
+def stats_completion(stats: str):
+    """Mean daily completion read from a MonthStats/YearStats relation."""
+    days = NullIf(F(f'{stats}__days'), 0)
+    return half_even_division(F(f'{stats}__completion_sum'), days)
+
+
+class YearQuerySet(models.QuerySet):
+    def with_completion(self):
+        """Annotate 'completion_pct': the mean daily completion of the year."""
+        return self.annotate(completion_pct=stats_completion('stats'))
+
+    def with_months(self):
+        return self.prefetch_related('months')
+
+
+class YearManager(models.Manager.from_queryset(YearQuerySet)):
+    pass
 
 
 class Year(models.Model):
     objects = YearManager()
 
-    yeardate = models.TextField(default=yeardate, primary_key=True)
+    yeardate = models.PositiveSmallIntegerField(default=yeardate, primary_key=True)
     comments = models.TextField(blank=True, null=True)
+    # Frozen into DaySnapshot rows (todos.snapshots)
+    closed = models.BooleanField(default=False, editable=False)
 
     class Meta:
         ordering = ['-yeardate']
 
     def __str__(self):
-        return self.yeardate
+        return str(self.yeardate)
 
 
 # =============================================================================
 
 
 def monthdate():
-    y, m, _ = str(datetime.date.today()).split('-')
-    return f"{y}-{m}"
+    """First day of the current month - the Month's key."""
+    return datetime.date.today().replace(day=1)
 
 
 def thisyear():
-    obj, _ = Year.objects.get_or_create(yeardate=yeardate())
-    return obj.yeardate
+    from todos.provisioning import ensure
+    return ensure(Year, yeardate())
 
 
-class MonthManager(models.Manager):
-    def get_queryset(self):
-        qs = super().get_queryset()
-        qs = qs.prefetch_related('days') # less queries, but slower (GCP cheaper ?)
-        return qs
+class MonthQuerySet(models.QuerySet):
+    def with_completion(self):
+        """Annotate 'completion_pct': the mean daily completion of the month."""
+        return self.annotate(completion_pct=stats_completion('stats'))
+
+    def with_days(self):
+        return self.prefetch_related('days')
+
+    def with_todolists(self, fields=None):
+        """
+        Prefetch the days together with their TODOLists (in one query).
+        With 'fields', only those TODOList fields are loaded.
+        """
+        days = Day.objects.select_related('todolist')
+        if fields is not None:
+            days = days.only('month', *(f'todolist__{field}' for field in fields))
+        return self.prefetch_related(models.Prefetch('days', queryset=days))
+
+
+class MonthManager(models.Manager.from_queryset(MonthQuerySet)):
+    pass
 
 
 class Month(models.Model):
     objects = MonthManager()
 
-    monthdate = models.TextField(default=monthdate, primary_key=True)
+    monthdate = models.DateField(default=monthdate, primary_key=True)
     year = models.ForeignKey(
         Year, related_name='months', default=thisyear, on_delete=models.PROTECT)
     comments = models.TextField(blank=True, null=True)
+    # Bumped whenever the month's rows change (todos.changelist_cache)
+    version = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ['-monthdate']
 
     def __str__(self):
-        return self.monthdate
+        return f"{self.monthdate:%Y-%m}"
+
+    def save(self, *args, **kwargs):
+        # Only ever bumped with F(): an update must not write back a stale version
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'version'
+            ]
+        super().save(*args, **kwargs)
 
 
 # =============================================================================
 
 
 def thismonth():
-    obj, _ = Month.objects.get_or_create(monthdate=monthdate())
-    return obj.monthdate
+    from todos.provisioning import ensure
+    return ensure(Month, monthdate())
 
 
-class DayManager(models.Manager):
-    def get_queryset(self):
-        qs = super().get_queryset()
-        qs = qs.select_related('month')
-        return qs
+class DayQuerySet(models.QuerySet):
+    def with_month(self):
+        return self.select_related('month')
+
+
+class DayManager(models.Manager.from_queryset(DayQuerySet)):
+    pass
 
 
 class Day(models.Model):
@@ -98,16 +145,72 @@ class Day(models.Model):
         return str(self.daydate)
 
 
+class JournalIndex(models.Model):
+    """A day's row of the full-text index: a table of todos.search, read-only here."""
+    day = models.OneToOneField(
+        Day, primary_key=True, related_name='journal', on_delete=models.DO_NOTHING,
+        db_constraint=False)
+    document = models.TextField()
+
+    class Meta:
+        managed = False
+        db_table = 'todos_journalindex'
+
 
 # =============================================================================
 
 
 def thisday():
-    obj, _ = Day.objects.get_or_create(daydate=str(datetime.date.today()))
-    return obj.daydate
+    from todos.provisioning import ensure
+    return ensure(Day, datetime.date.today())
+
+
+MARKS_PLUS = ('awareness', 'happiness', 'openness', 'focus')
+MARKS_MINUS = ('anger', 'fear', 'emptiness', 'chaos')
+
+
+class TODOListQuerySet(models.QuerySet):
+    def with_completion(self):
+        """Annotate 'completion_pct' - the same value compl_daily() returns."""
+        return self.annotate(completion_pct=Coalesce(
+            'completion', self.model.RULES.completion_expression()))
+
+    def with_mood_balance(self):
+        """Annotate 'balance' - the same value mood_balance() returns."""
+        plus = sum((F(mark) for mark in MARKS_PLUS[1:]), F(MARKS_PLUS[0]))
+        minus = sum((F(mark) for mark in MARKS_MINUS[1:]), F(MARKS_MINUS[0]))
+        any_missing = Q()
+        for mark in (*MARKS_PLUS, *MARKS_MINUS):
+            any_missing |= Q(**{f'{mark}__isnull': True})
+        output_field = models.DecimalField(max_digits=4, decimal_places=2)
+        balance = Case(
+            When(any_missing, then=Value(None)),
+            default=(plus - minus) * Value(Decimal('0.25')),
+            output_field=output_field,
+        )
+        return self.annotate(balance=Coalesce('mood_balance', balance, output_field=output_field))
+
+    def only_era_fields(self):
+        """Load only the columns the model's era reads (see TODOList.era_fields())."""
+        return self.only(*self.model.era_fields())
+
+
+class TODOListManager(models.Manager.from_queryset(TODOListQuerySet)):
+    pass
+
+
+class EraManager(TODOListManager):
+    """TODOLists of the model's era: dates in [START, END), era columns only."""
+    def get_queryset(self):
+        qs = super().get_queryset()
+        qs = qs.filter(date__gte=self.model.START, date__lt=self.model.END)
+        qs = qs.only_era_fields()
+        return qs
 
 
 class TODOList(models.Model):
+    objects = TODOListManager()
+
     INFO_FIELDS = [
         'comments',
         'awareness', 'happiness', 'openness', 'focus',
@@ -115,6 +218,10 @@ class TODOList(models.Model):
     ]
     TODO_FIELDS = []
     CONDITIONS = {}
+    RULES = None    # CompletionRules compiled from CONDITIONS in TodosConfig.ready()
+    START = None    # first day of an era proxy
+    END = None      # first day after an era proxy
+    FIELD_LABELS = {}   # era's own labels of fields, applied by TODOListAdmin
 
     MARKS = [
         (0, '0'),
@@ -195,22 +302,54 @@ class TODOList(models.Model):
     # comments
     comments = models.TextField(blank=True, null=True)
 
+    # scores, recomputed on save from the era's rules
+    completion = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    mood_balance = models.DecimalField(
+        max_digits=4, decimal_places=2, null=True, blank=True, editable=False)
+
     class Meta:
-        ordering = ['-date__daydate']
+        ordering = ['-date_id']
 
+    @classmethod
+    def era_fields(cls) -> tuple:
+        """Columns the era displays, scores and rolls up into Month/Year stats."""
+        return (
+            'date', *cls.TODO_FIELDS, *cls.INFO_FIELDS, *cls.RULES.fields,
+            'noA', *MARKS_PLUS, *MARKS_MINUS, 'completion', 'mood_balance',
+        )
 
-# ----------------------------------------------------
+    def save(self, *args, **kwargs):
+        from todos import rollups, scores, streaks
 
+        scores.update_scores(self)
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], *scores.SCORE_FIELDS}
 
-class TODOList2016EndManager(models.Manager):
-    def get_queryset(self):
-        qs = super().get_queryset()
-        qs = qs.filter(date__daydate__year="2016")
-        return qs
+        with transaction.atomic():
+            # Locked: a concurrent save of the day waits and then reads this one
+            saved = list(TODOList.objects.select_for_update().filter(pk=self.pk).order_by())
+            super().save(*args, **kwargs)
+            rollups.apply(rollups.contributions(saved), rollups.contributions([self]))
+            streaks.apply(streaks.done(saved), streaks.done([self]))
+
+    def delete(self, *args, **kwargs):
+        from todos import rollups, streaks
+
+        with transaction.atomic():
+            saved = list(TODOList.objects.select_for_update().filter(pk=self.pk).order_by())
+            res = super().delete(*args, **kwargs)
+            rollups.apply(rollups.contributions(saved), {})
+            streaks.apply(streaks.done(saved), {})
+        return res
+
+
+# ----------------------------------------------------
 
 
 class TODOList2016End(TODOList):
-    objects = TODOList2016EndManager()
+    objects = EraManager()
+    START = datetime.date(2016, 1, 1)
+    END = datetime.date(2017, 1, 1)
 
     TODO_FIELDS = [
         "MED2", "MED3", "SATYR",
@@ -231,32 +370,24 @@ class TODOList2016End(TODOList):
         'ONEOF': [],
     }
 
+    FIELD_LABELS = {
+        'MED2': 'DoNothing',
+        'MED3': 'Awareness',
+    }
+
     class Meta:
         proxy = True
         verbose_name = "TODO 2016[end]"
         verbose_name_plural = "TODOs 2016[end]"
 
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._meta.get_field('MED2').verbose_name = 'DoNothing'
-        self._meta.get_field('MED3').verbose_name = 'Awareness'
-
-
 # ----------------------------------------------------
 
 
-class TODOList2017JanJulManager(models.Manager):
-    def get_queryset(self):
-        qs = super().get_queryset()
-        qs = qs.filter(
-            date__daydate__year="2017",
-            date__daydate__month__lte="07")
-        return qs
-
-
 class TODOList2017JanJul(TODOList):
-    objects = TODOList2017JanJulManager()
+    objects = EraManager()
+    START = datetime.date(2017, 1, 1)
+    END = datetime.date(2017, 8, 1)
 
     TODO_FIELDS = [
         "MILAM", "DREAM", "MED", "MED2", "MED3", "SATYR", "RELAX",
@@ -288,32 +419,25 @@ class TODOList2017JanJul(TODOList):
         'ONEOF': [],
     }
 
+    FIELD_LABELS = {
+        'MED': 'Mindfulness',
+        'MED2': 'Contemplation',
+        'MED3': 'Awareness',
+    }
+
     class Meta:
         proxy = True
         verbose_name = "TODO 2017[1] Jan-Jul"
         verbose_name_plural = "TODOs 2017[1] Jan-Jul"
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._meta.get_field('MED').verbose_name = 'Mindfulness'
-        self._meta.get_field('MED2').verbose_name = 'Contemplation'
-        self._meta.get_field('MED3').verbose_name = 'Awareness'
-
 
 # ----------------------------------------------------
 
 
-class TODOList2017AugDecManager(models.Manager):
-    def get_queryset(self):
-        qs = super().get_queryset()
-        qs = qs.filter(
-            date__daydate__year="2017",
-            date__daydate__month__gte="08")
-        return qs
-
-
 class TODOList2017AugDec(TODOList):
-    objects = TODOList2017AugDecManager()
+    objects = EraManager()
+    START = datetime.date(2017, 8, 1)
+    END = datetime.date(2018, 1, 1)
 
     TODO_FIELDS = [
         "MILAM", "DREAM", "MED", "MED3", "TETRIS", "SATYR", "RELAX",
@@ -345,29 +469,24 @@ class TODOList2017AugDec(TODOList):
         'ONEOF': [],
     }
 
+    FIELD_LABELS = {
+        'MED': 'Mindfulness',
+        'MED3': 'Awareness',
+    }
+
     class Meta:
         proxy = True
         verbose_name = "TODO 2017[2] Aug-Dec"
         verbose_name_plural = "TODOs 2017[2] Aug-Dec"
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._meta.get_field('MED').verbose_name = 'Mindfulness'
-        self._meta.get_field('MED3').verbose_name = 'Awareness'
-
 
 # ----------------------------------------------------
 
 
-class TODOList2018Manager(models.Manager):
-    def get_queryset(self):
-        qs = super().get_queryset()
-        qs = qs.filter(date__daydate__year="2018")
-        return qs
-
-
 class TODOList2018(TODOList):
-    objects = TODOList2018Manager()
+    objects = EraManager()
+    START = datetime.date(2018, 1, 1)
+    END = datetime.date(2019, 1, 1)
 
     TODO_FIELDS = [
         "MILAM", "DREAM", "MED", "MED2", "MED3", "TETRIS", "SATYR", "RELAX",
@@ -399,30 +518,25 @@ class TODOList2018(TODOList):
         'ONEOF': [],
     }
 
+    FIELD_LABELS = {
+        'MED': 'Mindfulness',
+        'MED2': 'FOCUS',
+        'MED3': 'Awareness',
+    }
+
     class Meta:
         proxy = True
         verbose_name = "TODO 2018"
         verbose_name_plural = "TODOs 2018"
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._meta.get_field('MED').verbose_name = 'Mindfulness'
-        self._meta.get_field('MED2').verbose_name = 'FOCUS'
-        self._meta.get_field('MED3').verbose_name = 'Awareness'
-
 
 # ----------------------------------------------------
 
 
-class TODOList2019Manager(models.Manager):
-    def get_queryset(self):
-        qs = super().get_queryset()
-        qs = qs.filter(date__daydate__year="2019")
-        return qs
-
-
 class TODOList2019(TODOList):
-    objects = TODOList2019Manager()
+    objects = EraManager()
+    START = datetime.date(2019, 1, 1)
+    END = datetime.date(2020, 1, 1)
 
     TODO_FIELDS = [
         "DREAM", "MED", "MED2", "MED3", "TETRIS", "RELAX",
@@ -452,30 +566,25 @@ class TODOList2019(TODOList):
         'ONEOF': [],
     }
 
+    FIELD_LABELS = {
+        'MED': 'Mindfulness',
+        'MED2': 'FOCUS',
+        'MED3': 'DoNothing',
+    }
+
     class Meta:
         proxy = True
         verbose_name = "TODO 2019"
         verbose_name_plural = "TODOs 2019"
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._meta.get_field('MED').verbose_name = 'Mindfulness'
-        self._meta.get_field('MED2').verbose_name = 'FOCUS'
-        self._meta.get_field('MED3').verbose_name = 'DoNothing'
-
 
 # ----------------------------------------------------
 
 
-class TODOList2020Manager(models.Manager):
-    def get_queryset(self):
-        qs = super().get_queryset()
-        qs = qs.filter(date__daydate__year="2020")
-        return qs
-
-
 class TODOList2020(TODOList):
-    objects = TODOList2020Manager()
+    objects = EraManager()
+    START = datetime.date(2020, 1, 1)
+    END = datetime.date(2021, 1, 1)
 
     TODO_FIELDS = [
         "DREAM", "MED", "MED2", "MED3", "TETRIS", "RELAX",
@@ -504,30 +613,25 @@ class TODOList2020(TODOList):
         'ONEOF': [],
     }
 
+    FIELD_LABELS = {
+        'MED': 'Mindfulness',
+        'MED2': 'FOCUS',
+        'MED3': 'Contemplation',
+    }
+
     class Meta:
         proxy = True
         verbose_name = "TODO 2020"
         verbose_name_plural = "TODOs 2020"
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._meta.get_field('MED').verbose_name = 'Mindfulness'
-        self._meta.get_field('MED2').verbose_name = 'FOCUS'
-        self._meta.get_field('MED3').verbose_name = 'Contemplation'
-
 
 # ----------------------------------------------------
 
 
-class TODOList2021Manager(models.Manager):
-    def get_queryset(self):
-        qs = super().get_queryset()
-        qs = qs.filter(date__daydate__year="2021")
-        return qs
-
-
 class TODOList2021(TODOList):
-    objects = TODOList2021Manager()
+    objects = EraManager()
+    START = datetime.date(2021, 1, 1)
+    END = datetime.date(2022, 1, 1)
 
     TODO_FIELDS = [
         "MED", "MED2", "MED3", "TETRIS", "RELAX",
@@ -556,30 +660,25 @@ class TODOList2021(TODOList):
         ],
     }
 
+    FIELD_LABELS = {
+        'MED': 'FOCUS',
+        'MED2': 'Mindfulness',
+        'MED3': 'FOCUS',
+    }
+
     class Meta:
         proxy = True
         verbose_name = "TODO 2021"
         verbose_name_plural = "TODOs 2021"
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._meta.get_field('MED').verbose_name = 'FOCUS'
-        self._meta.get_field('MED2').verbose_name = 'Mindfulness'
-        self._meta.get_field('MED3').verbose_name = 'FOCUS'
-
 
 # ----------------------------------------------------
 
 
-class TODOList2022Manager(models.Manager):
-    def get_queryset(self):
-        qs = super().get_queryset()
-        qs = qs.filter(date__daydate__year="2022")
-        return qs
-
-
 class TODOList2022(TODOList2021):
-    objects = TODOList2022Manager()
+    objects = EraManager()
+    START = datetime.date(2022, 1, 1)
+    END = datetime.date(2023, 1, 1)
 
     class Meta:
         proxy = True
@@ -590,15 +689,10 @@ class TODOList2022(TODOList2021):
 # ----------------------------------------------------
 
 
-class TODOList2023Manager(models.Manager):
-    def get_queryset(self):
-        qs = super().get_queryset()
-        qs = qs.filter(date__daydate__year="2023")
-        return qs
-
-
 class TODOList2023(TODOList):
-    objects = TODOList2023Manager()
+    objects = EraManager()
+    START = datetime.date(2023, 1, 1)
+    END = datetime.date(2024, 1, 1)
 
     TODO_FIELDS = [
         'SUNWALK', 'MED', 'TETRIS', 'RELAX',
@@ -628,7 +722,7 @@ class TODOList2023(TODOList):
     }
 
     class Meta:
-        ordering = ['-date__daydate']
+        ordering = ['-date_id']
         proxy = True
         verbose_name = "TODO 2023"
         verbose_name_plural = "TODOs 2023"
@@ -640,18 +734,13 @@ class TODOList2023(TODOList):
 If nothing changes from year to year, the following code is enough to
 create a new-year's model. Admin is created and registered automatically.
 --> subclass previous year's model
---> change class names, filter, and verbose_name - as per current year's date
+--> change class name, START/END dates, and verbose_name - as per current year's date
 """
 
-# class TODOList2022Manager(models.Manager):
-#     def get_queryset(self):
-#         qs = super().get_queryset()
-#         qs = qs.filter(date__daydate__year="2022")
-#         return qs
-
-
 # class TODOList2022(TODOList2021):
-#     objects = TODOList2022Manager()
+#     objects = EraManager()
+#     START = datetime.date(2022, 1, 1)
+#     END = datetime.date(2023, 1, 1)
 
 #     class Meta:
 #         proxy = True
@@ -662,6 +751,101 @@ create a new-year's model. Admin is created and registered automatically.
 # =============================================================================
 
 
+class Stats(models.Model):
+    """TODOList totals of a period, kept current by todos.rollups."""
+    days = models.PositiveIntegerField(default=0)
+    completion_sum = models.PositiveIntegerField(default=0)
+    noA_sum = models.PositiveIntegerField(default=0)
+    noA_cnt = models.PositiveIntegerField(default=0)
+
+    # marks
+    awareness_sum = models.PositiveIntegerField(default=0)
+    awareness_cnt = models.PositiveIntegerField(default=0)
+    happiness_sum = models.PositiveIntegerField(default=0)
+    happiness_cnt = models.PositiveIntegerField(default=0)
+    openness_sum = models.PositiveIntegerField(default=0)
+    openness_cnt = models.PositiveIntegerField(default=0)
+    focus_sum = models.PositiveIntegerField(default=0)
+    focus_cnt = models.PositiveIntegerField(default=0)
+    anger_sum = models.PositiveIntegerField(default=0)
+    anger_cnt = models.PositiveIntegerField(default=0)
+    fear_sum = models.PositiveIntegerField(default=0)
+    fear_cnt = models.PositiveIntegerField(default=0)
+    emptiness_sum = models.PositiveIntegerField(default=0)
+    emptiness_cnt = models.PositiveIntegerField(default=0)
+    chaos_sum = models.PositiveIntegerField(default=0)
+    chaos_cnt = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def noA(self):
+        # Like a_monthly(): a single missing value spoils the total
+        return self.noA_sum if self.noA_cnt == self.days else "-"
+
+
+class YearStats(Stats):
+    year = models.OneToOneField(
+        Year, related_name='stats', on_delete=models.CASCADE, primary_key=True)
+
+    def __str__(self):
+        return str(self.year_id)
+
+
+class MonthStats(Stats):
+    month = models.OneToOneField(
+        Month, related_name='stats', on_delete=models.CASCADE, primary_key=True)
+
+    def __str__(self):
+        return str(self.month_id)
+
+
+class HabitStreak(models.Model):
+    """Current and longest runs of days a habit was done, kept current by todos.streaks."""
+    habit = models.CharField(max_length=50, primary_key=True)
+    last_day = models.DateField(null=True, blank=True)
+    current = models.PositiveIntegerField(default=0)
+    current_start = models.DateField(null=True, blank=True)
+    longest = models.PositiveIntegerField(default=0)
+    longest_start = models.DateField(null=True, blank=True)
+    longest_end = models.DateField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-current', '-longest']
+
+    def __str__(self):
+        return self.habit
+
+
+class DaySnapshot(models.Model):
+    """A closed year's TODOList changelist row, rendered by todos.snapshots."""
+    date = models.DateField(primary_key=True)
+    year = models.ForeignKey(Year, related_name='snapshots', on_delete=models.CASCADE)
+    # Named as the TODOList annotations, for the changelist's list filters
+    completion_pct = models.PositiveSmallIntegerField(null=True)
+    balance = models.DecimalField(max_digits=4, decimal_places=2, null=True)
+    cells = models.TextField()
+
+    class Meta:
+        ordering = ['-date']
+
+    def __str__(self):
+        return str(self.date)
+
+
+class CacheGeneration(models.Model):
+    """Counter of a per-process cache, bumped on writes, polled by todos.generations."""
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} {self.value}"
+
+
+# =============================================================================
+
+
 class Food(models.Model):
     name = models.CharField(max_length=100, unique=True)
     fat = models.DecimalField(max_digits=5, decimal_places=2, default=0)
@@ -0,0 +1,114 @@
+"""
+Keyset (seek) pagination of date-keyed changelists: TODOLists and Days.
+
+In its default, newest-first order such a changelist is paged by its
+primary key instead of OFFSET: ?before=<date> shows the rows older than
+the date, ?after=<date> the rows newer than it. Each page costs the same,
+however deep. Sorting by a column, searching or "show all" falls back to
+Django's numbered pages.
+"""
+import datetime
+from typing import Optional, Tuple
+
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ALL_VAR, ORDER_VAR, PAGE_VAR, ChangeList
+
+
+BEFORE_VAR = 'before'
+AFTER_VAR = 'after'
+
+
+def hierarchy_range(cl: ChangeList) -> Tuple[Optional[datetime.date], Optional[datetime.date]]:
+    """The [start, stop) dates selected in the changelist's date hierarchy."""
+    if not cl.date_hierarchy:
+        return None, None
+    year = cl.params.get(f"{cl.date_hierarchy}__year")
+    month = cl.params.get(f"{cl.date_hierarchy}__month")
+    day = cl.params.get(f"{cl.date_hierarchy}__day")
+    try:
+        if year and month and day:
+            start = datetime.date(int(year), int(month), int(day))
+            return start, start + datetime.timedelta(days=1)
+        if year and month:
+            start = datetime.date(int(year), int(month), 1)
+            return start, (start + datetime.timedelta(days=31)).replace(day=1)
+        if year:
+            return datetime.date(int(year), 1, 1), datetime.date(int(year) + 1, 1, 1)
+    except ValueError as exc:
+        raise IncorrectLookupParameters(exc) from exc
+    return None, None
+
+
+class KeysetChangeList(ChangeList):
+    def get_filters_params(self, params=None):
+        params = super().get_filters_params(params)
+        params.pop(BEFORE_VAR, None)
+        params.pop(AFTER_VAR, None)
+        return params
+
+    def get_results(self, request):
+        self.keyset = None
+        if (ORDER_VAR in self.params or ALL_VAR in self.params or PAGE_VAR in request.GET
+                or self.query):
+            # Sorted (or ranked search) results are not in key order
+            return super().get_results(request)
+
+        try:
+            before = self.params.get(BEFORE_VAR)
+            before = before and datetime.date.fromisoformat(before)
+            after = self.params.get(AFTER_VAR)
+            after = after and datetime.date.fromisoformat(after)
+        except ValueError as exc:
+            raise IncorrectLookupParameters(exc) from exc
+
+        per_page = self.list_per_page
+        pks = self.queryset.values_list('pk', flat=True)
+        if after:
+            # The page right above 'after': the oldest 'per_page' newer rows
+            pks = list(pks.filter(pk__gt=after).order_by('pk')[:per_page + 1])
+            has_newer, has_older = len(pks) > per_page, True
+            pks = sorted(pks[:per_page], reverse=True)
+        else:
+            if before:
+                pks = pks.filter(pk__lt=before)
+            pks = list(pks.order_by('-pk')[:per_page + 1])
+            has_newer, has_older = bool(before), len(pks) > per_page
+            pks = pks[:per_page]
+
+        if pks:
+            result_list = self.queryset.filter(pk__lte=pks[0], pk__gte=pks[-1])
+        else:
+            result_list = self.queryset.none()
+
+        result_count, full_result_count = self.model_admin.get_keyset_counts(request, self)
+        self.result_count = result_count
+        self.show_full_result_count = full_result_count is not None
+        self.show_admin_actions = not self.show_full_result_count or bool(full_result_count)
+        self.full_result_count = full_result_count
+        self.result_list = result_list
+        self.can_show_all = result_count <= self.list_max_show_all
+        self.multi_page = has_newer or has_older
+        self.paginator = None
+        self.keyset = {
+            'cl': self,
+            'newer_url': has_newer and pks and self.get_query_string(
+                {AFTER_VAR: pks[0]}, [BEFORE_VAR]),
+            'older_url': has_older and pks and self.get_query_string(
+                {BEFORE_VAR: pks[-1]}, [AFTER_VAR]),
+            'show_all_url': self.can_show_all and self.multi_page and self.get_query_string(
+                {ALL_VAR: ""}, [BEFORE_VAR, AFTER_VAR]),
+        }
+
+
+class KeysetPaginationMixin:
+    """ModelAdmin mixin: keyset-paginated changelist (see KeysetChangeList)."""
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+    def get_keyset_counts(self, request, cl: KeysetChangeList) -> Tuple[int, Optional[int]]:
+        """
+        (rows matching the filters, rows in total or None to not show it).
+        Override with a cheaper source than COUNT where there is one.
+        """
+        return cl.queryset.count(), None
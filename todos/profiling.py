@@ -0,0 +1,118 @@
+"""
+Opt-in request profiling from real traffic.
+
+SamplingProfilerMiddleware runs cProfile on a PROFILING_SAMPLE_RATE
+fraction of requests and times the SQL of every request. A profiled
+request, or one slower than PROFILING_SLOW_MS, is written to PROFILING_DIR:
+<name>.prof (pstats, e.g. "python -m pstats" or snakeviz) for profiled
+requests and <name>.json with the URL, the timings and the slowest
+queries. A slow request that wasn't sampled has no .prof. Only the newest
+PROFILING_MAX_RECORDS records are kept.
+
+With both settings at 0 (the default) the middleware removes itself.
+"""
+import cProfile
+import datetime
+import json
+import os
+import random
+import re
+import time
+from contextlib import ExitStack
+from typing import List
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+
+SLOWEST_QUERIES = 50
+
+
+class QueryTimer:
+    """connection.execute_wrapper() recording each query's SQL and time."""
+
+    def __init__(self) -> None:
+        self.queries: List[dict] = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'alias': context['connection'].alias,
+                'sql': sql,
+                'ms': round((time.perf_counter() - start) * 1000, 3),
+            })
+
+
+def _name(request, elapsed_ms: float) -> str:
+    path = re.sub(r"[^A-Za-z0-9]+", "-", request.path).strip("-")[:80] or "root"
+    return f"{datetime.datetime.now():%Y%m%d-%H%M%S-%f}-{request.method}-{path}-{elapsed_ms:.0f}ms"
+
+
+class SamplingProfilerMiddleware:
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'PROFILING_SAMPLE_RATE', 0)
+        self.slow_ms = getattr(settings, 'PROFILING_SLOW_MS', 0)
+        if not self.sample_rate and not self.slow_ms:
+            raise MiddlewareNotUsed
+        self.directory = settings.PROFILING_DIR
+        self.max_records = getattr(settings, 'PROFILING_MAX_RECORDS', 200)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __call__(self, request):
+        profiler = None
+        if random.random() < self.sample_rate:
+            profiler = cProfile.Profile()
+        timer = QueryTimer()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            start = time.perf_counter()
+            if profiler is not None:
+                try:
+                    profiler.enable()
+                except ValueError:
+                    # Another profiler is active in this thread
+                    profiler = None
+            try:
+                response = self.get_response(request)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if profiler is not None or (self.slow_ms and elapsed_ms >= self.slow_ms):
+            self.record(request, response, elapsed_ms, profiler, timer.queries)
+        return response
+
+    def record(self, request, response, elapsed_ms: float, profiler, queries: List[dict]) -> None:
+        name = os.path.join(self.directory, _name(request, elapsed_ms))
+        if profiler is not None:
+            profiler.dump_stats(f"{name}.prof")
+        with open(f"{name}.json", 'w') as f:
+            json.dump({
+                'url': request.get_full_path(),
+                'method': request.method,
+                'status': response.status_code,
+                'ms': round(elapsed_ms, 1),
+                'profiled': profiler is not None,
+                'sql_count': len(queries),
+                'sql_ms': round(sum(query['ms'] for query in queries), 1),
+                'slowest_sql': sorted(queries, key=lambda query: query['ms'], reverse=True)[:SLOWEST_QUERIES],
+            }, f, indent=2)
+        self.prune()
+
+    def prune(self) -> None:
+        records = sorted(
+            entry.name[:-len('.json')] for entry in os.scandir(self.directory)
+            if entry.name.endswith('.json'))
+        for stale in records[:-self.max_records or None]:
+            for suffix in ('.json', '.prof'):
+                try:
+                    os.remove(os.path.join(self.directory, stale + suffix))
+                except FileNotFoundError:
+                    pass
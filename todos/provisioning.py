@@ -0,0 +1,52 @@
+"""
+Calendar rows (Year, Month, Day) created in bulk, ahead of the TODOLists.
+
+The keys of rows known to exist are remembered per process, so the model
+field defaults (thisyear, thismonth, thisday) only hit the database the
+first time a process meets a new key. They are forgotten with the
+hierarchy buckets, when calendar rows are deleted in any process.
+"""
+import datetime
+from typing import Set, Tuple
+
+from django.db import transaction
+
+from todos import generations, hierarchy
+from todos.models import Day, Month, Year
+
+
+_known: Set[Tuple[type, object]] = set()
+
+generations.register(hierarchy.GENERATION, _known.clear)
+
+
+def ensure(model, key):
+    """Return 'key' after making sure a 'model' row with that pk exists."""
+    if (model, key) not in _known:
+        model.objects.get_or_create(pk=key)
+        # A row created in a transaction that rolls back doesn't exist
+        transaction.on_commit(lambda: _known.add((model, key)))
+    return key
+
+
+def provision(first_year: int, last_year: int) -> Tuple[int, int, int]:
+    """Create all missing Year, Month and Day rows of the years (inclusive)."""
+    years, months, days = [], [], []
+    for y in range(first_year, last_year + 1):
+        years.append(Year(yeardate=y))
+        for m in range(1, 13):
+            months.append(Month(monthdate=datetime.date(y, m, 1), year_id=y))
+        day = datetime.date(y, 1, 1)
+        while day.year == y:
+            days.append(Day(daydate=day, month_id=day.replace(day=1)))
+            day += datetime.timedelta(days=1)
+
+    with transaction.atomic():
+        Year.objects.bulk_create(years, ignore_conflicts=True)
+        Month.objects.bulk_create(months, ignore_conflicts=True)
+        Day.objects.bulk_create(days, batch_size=500, ignore_conflicts=True)
+        hierarchy.changed()
+
+    transaction.on_commit(lambda: _known.update(
+        (type(obj), obj.pk) for obj in years + months + days))
+    return len(years), len(months), len(days)
@@ -0,0 +1,155 @@
+"""
+Query budgets: a maximum number of SQL queries and of total SQL time.
+
+    with QueryBudget(max_queries=7, max_ms=200, label="Month changelist"):
+        ...
+
+    @QueryBudget(max_queries=3)
+    def view(request): ...
+
+Exceeding the budget raises QueryBudgetExceeded with the executed SQL
+grouped by call site (the innermost frame of this project's code, not
+counting middleware) and statement, so a query that runs once per row shows up as one line with
+many hits.
+"""
+import functools
+import os
+import time
+import traceback
+from collections import defaultdict
+from contextlib import ContextDecorator, ExitStack
+from importlib import import_module
+from typing import FrozenSet, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connections
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def _is_project_frame(filename: str) -> bool:
+    return (
+        filename.startswith(str(settings.BASE_DIR))
+        and 'site-packages' not in filename
+        and filename != __file__
+    )
+
+
+# Middleware wraps every request: its frames are on the stack of every query
+MIDDLEWARE_METHODS = {
+    '__call__', 'process_request', 'process_view', 'process_template_response',
+    'process_response', 'process_exception',
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _middleware_files() -> FrozenSet[str]:
+    return frozenset(
+        import_module(path.rsplit('.', 1)[0]).__file__ for path in settings.MIDDLEWARE)
+
+
+def _is_middleware_frame(frame: traceback.FrameSummary) -> bool:
+    return frame.name in MIDDLEWARE_METHODS and frame.filename in _middleware_files()
+
+
+def _is_orm_frame(filename: str) -> bool:
+    return os.path.join('django', 'db') in filename or filename == __file__
+
+
+def _describe(frame: traceback.FrameSummary) -> str:
+    path = frame.filename
+    if _is_project_frame(path):
+        path = os.path.relpath(path, settings.BASE_DIR)
+    elif 'site-packages' in path:
+        path = path.split('site-packages' + os.sep, 1)[1]
+    return f"{path}:{frame.lineno} in {frame.name}"
+
+
+def call_site() -> str:
+    """
+    The innermost frame of this project's code and, when the query comes
+    from deeper (admin, templates, sessions), the innermost frame outside
+    the ORM. Middleware frames don't count as the project's code.
+    """
+    stack = traceback.extract_stack()
+    project = next((
+        f for f in reversed(stack)
+        if _is_project_frame(f.filename) and not _is_middleware_frame(f)), None)
+    caller = next((f for f in reversed(stack) if not _is_orm_frame(f.filename)), None)
+    if project is None:
+        return _describe(caller) if caller else "<unknown>"
+    site = _describe(project)
+    if caller is not None and caller is not project:
+        site += f" via {_describe(caller)}"
+    return site
+
+
+class QueryBudget(ContextDecorator):
+    def __init__(self, max_queries: Optional[int] = None, max_ms: Optional[float] = None,
+                 label: str = "", using: Tuple[str, ...] = ('default',)) -> None:
+        self.max_queries = max_queries
+        self.max_ms = max_ms
+        self.label = label
+        self.using = using
+        self.queries: List[Tuple[str, str, float]] = []    # (call site, sql, ms)
+
+    def __repr__(self) -> str:
+        return f"<QueryBudget queries<={self.max_queries} ms<={self.max_ms}>"
+
+    def scaled(self, time_scale: float, label: str = "") -> "QueryBudget":
+        """A copy with the time limit multiplied by 'time_scale'."""
+        max_ms = None if self.max_ms is None else self.max_ms * time_scale
+        return QueryBudget(self.max_queries, max_ms, label or self.label, self.using)
+
+    def _record(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                (call_site(), sql, (time.perf_counter() - start) * 1000))
+
+    def __enter__(self):
+        self.queries = []
+        self._stack = ExitStack()
+        for alias in self.using:
+            self._stack.enter_context(connections[alias].execute_wrapper(self._record))
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self._stack.close()
+        if exc_type is None:
+            self.check()
+        return False
+
+    @property
+    def total_ms(self) -> float:
+        return sum(ms for _, _, ms in self.queries)
+
+    def check(self) -> None:
+        problems = []
+        if self.max_queries is not None and len(self.queries) > self.max_queries:
+            problems.append(f"{len(self.queries)} queries (budget {self.max_queries})")
+        if self.max_ms is not None and self.total_ms > self.max_ms:
+            problems.append(f"{self.total_ms:.1f} ms of SQL (budget {self.max_ms:.0f} ms)")
+        if problems:
+            raise QueryBudgetExceeded(
+                f"{self.label or 'Query budget'} exceeded: {', '.join(problems)}\n"
+                + self.report())
+
+    def report(self) -> str:
+        """Queries grouped by (call site, SQL), the most repeated first."""
+        groups = defaultdict(list)
+        for site, sql, ms in self.queries:
+            groups[site, sql].append(ms)
+        lines = []
+        for (site, sql), timings in sorted(groups.items(), key=lambda item: -len(item[1])):
+            lines.append(f"  {len(timings):>4}x {sum(timings):8.1f} ms  {site}")
+            lines.append(f"         {sql[:200]}")
+        return "\n".join(lines)
+
+
+# Changelists of admins without a query_budget
+DEFAULT_BUDGET = QueryBudget(max_queries=10, max_ms=500)
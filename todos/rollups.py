@@ -0,0 +1,132 @@
+"""
+Incremental maintenance of the MonthStats and YearStats rollups.
+
+A TODOList contributes a Counter of Stats fields to its month and year.
+Saving a TODOList applies the difference between its old and new
+contribution with F() updates, in the same transaction as the save.
+"""
+import datetime
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Optional
+
+from django.db import transaction
+from django.db.models import F, Sum
+
+from todos import changelist_cache
+from todos.admin_utils import compl_daily
+from todos.models import (
+    MARKS_MINUS, MARKS_PLUS, Month, MonthStats, TODOList, Year, YearStats,
+)
+
+
+MARK_FIELDS = (*MARKS_PLUS, *MARKS_MINUS)
+
+
+def _date(todolist: TODOList) -> datetime.date:
+    return datetime.date.fromisoformat(str(todolist.date_id))
+
+
+def month_key(date: datetime.date) -> datetime.date:
+    return date.replace(day=1)
+
+
+def year_key(date: datetime.date) -> int:
+    return date.year
+
+
+def todolist_count(start: Optional[datetime.date] = None,
+                   stop: Optional[datetime.date] = None) -> int:
+    """
+    TODOLists dated in [start, stop): the 'days' of the whole months in the
+    range, plus a bounded COUNT of the days of a partial first/last month.
+    """
+    first = start and month_key(start)
+    if start and start != first:
+        first = month_key(start + datetime.timedelta(days=31))
+    last = stop and month_key(stop)
+    if first and last and first >= last:
+        return TODOList.objects.filter(date__gte=start, date__lt=stop).count()
+
+    months = MonthStats.objects.all()
+    if first:
+        months = months.filter(month__gte=first)
+    if last:
+        months = months.filter(month__lt=last)
+    res = months.aggregate(days=Sum('days'))['days'] or 0
+    if start and start != first:
+        res += TODOList.objects.filter(date__gte=start, date__lt=first).count()
+    if stop and stop != last:
+        res += TODOList.objects.filter(date__gte=last, date__lt=stop).count()
+    return res
+
+
+def contribution(todolist: TODOList) -> Counter:
+    res = Counter(days=1, completion_sum=compl_daily(todolist))
+    if todolist.noA is not None:
+        res['noA_sum'] += todolist.noA
+        res['noA_cnt'] += 1
+    for mark in MARK_FIELDS:
+        value = getattr(todolist, mark)
+        if value is not None:
+            res[f'{mark}_sum'] += value
+            res[f'{mark}_cnt'] += 1
+    return res
+
+
+def contributions(todolists: Iterable[TODOList]) -> Dict[datetime.date, Counter]:
+    return {_date(todolist): contribution(todolist) for todolist in todolists}
+
+
+def apply(old: Dict[datetime.date, Counter], new: Dict[datetime.date, Counter]) -> None:
+    """Move the rollups from the 'old' to the 'new' contributions."""
+    deltas = defaultdict(Counter)
+    for sign, contribs in ((-1, old), (1, new)):
+        for date, contrib in contribs.items():
+            for key in ((MonthStats, month_key(date)), (YearStats, year_key(date))):
+                for field, value in contrib.items():
+                    deltas[key][field] += sign * value
+
+    for (stats_model, pk), delta in deltas.items():
+        delta = {field: value for field, value in delta.items() if value}
+        if not delta:
+            continue
+        updated = stats_model.objects.filter(pk=pk).update(
+            **{field: F(field) + value for field, value in delta.items()})
+        if not updated:
+            _rebuild_one(stats_model, pk)
+
+
+def _rebuild_one(stats_model, pk) -> None:
+    if stats_model is MonthStats:
+        parent, todolists = Month, TODOList.objects.filter(date__month=pk)
+    else:
+        parent, todolists = Year, TODOList.objects.filter(date__month__year=pk)
+    with transaction.atomic():
+        # The Month/Year row is the lock: a concurrent rebuild of the same
+        # stats waits for its commit and then counts its TODOLists too
+        if not parent.objects.select_for_update().filter(pk=pk).values_list('pk', flat=True):
+            return
+        total = sum(contributions(todolists.order_by()).values(), Counter())
+        stats_model.objects.update_or_create(pk=pk, defaults=dict(total))
+
+
+def rebuild() -> None:
+    """Recompute all rollups from scratch."""
+    month_totals, year_totals = defaultdict(Counter), defaultdict(Counter)
+    for todolist in TODOList.objects.order_by().iterator(chunk_size=2000):
+        date, contrib = _date(todolist), contribution(todolist)
+        month_totals[month_key(date)].update(contrib)
+        year_totals[year_key(date)].update(contrib)
+
+    months = set(Month.objects.values_list('pk', flat=True))
+    years = set(Year.objects.values_list('pk', flat=True))
+    with transaction.atomic():
+        MonthStats.objects.all().delete()
+        YearStats.objects.all().delete()
+        MonthStats.objects.bulk_create(
+            MonthStats(month_id=pk, **total)
+            for pk, total in month_totals.items() if pk in months)
+        YearStats.objects.bulk_create(
+            YearStats(year_id=pk, **total)
+            for pk, total in year_totals.items() if pk in years)
+        changelist_cache.bump_all()
@@ -0,0 +1,118 @@
+from typing import Any, Callable, Tuple
+
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.lookups import Exact, GreaterThan
+
+
+def is_true(value: Any) -> bool:
+    return value is True
+
+
+def is_zero(value: Any) -> bool:
+    return value == 0
+
+
+def is_nonempty(value: Any) -> bool:
+    return value != ""
+
+
+class AtLeast:
+    def __init__(self, minimum) -> None:
+        self.minimum = minimum
+
+    def __call__(self, value: Any) -> bool:
+        return value >= self.minimum
+
+
+def round_half_even(numerator: int, denominator: int) -> int:
+    """numerator / denominator rounded like round() does: halves to even."""
+    quotient, rest = divmod(numerator, denominator)
+    if 2 * rest > denominator or (2 * rest == denominator and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+def half_even_division(numerator, denominator):
+    """round_half_even() of two non-negative integer SQL expressions."""
+    quotient = numerator / denominator
+    twice_rest = 2 * (numerator - quotient * denominator)
+    return Case(
+        When(GreaterThan(twice_rest, denominator), then=quotient + 1),
+        When(Exact(twice_rest, denominator), then=quotient + quotient % 2),
+        default=quotient,
+        output_field=IntegerField(),
+    )
+
+
+class CompletionRules:
+    """
+    TODOList.CONDITIONS of one era compiled into flat (field, predicate) pairs.
+
+    Built once per era model in TodosConfig.ready(), so scoring a TODOList is
+    a single loop over precomputed checks with a precomputed denominator.
+    """
+
+    def __init__(self, conditions: dict) -> None:
+        checks = [
+            *((field, is_true) for field in conditions.get('TRUE', [])),
+            *((field, is_zero) for field in conditions.get('ZERO', [])),
+            *((field, AtLeast(minimum))
+              for field, minimum in conditions.get('MINIMUM', {}).items()),
+            *((field, is_nonempty) for field in conditions.get('NONEMPTYSTR', [])),
+        ]
+        self.checks: Tuple[Tuple[str, Callable[[Any], bool]], ...] = tuple(checks)
+        self.oneof_fields: Tuple[str, ...] = tuple(conditions.get('ONEOF', []))
+
+        # The same checks as SQL conditions, for the completion annotation.
+        # Negated lookups match NULL too, like `None != ""` does in Python.
+        self.q_objects = (
+            *(Q(**{field: True}) for field in conditions.get('TRUE', [])),
+            *(Q(**{field: 0}) for field in conditions.get('ZERO', [])),
+            *(Q(**{f"{field}__gte": minimum})
+              for field, minimum in conditions.get('MINIMUM', {}).items()),
+            *(~Q(**{field: ""}) for field in conditions.get('NONEMPTYSTR', [])),
+        )
+        if self.oneof_fields:
+            oneof_q = Q()
+            for field in self.oneof_fields:
+                oneof_q |= ~Q(**{field: ""})
+            self.q_objects += (oneof_q,)
+
+        # All 'ONEOF' fields together count as a single condition
+        self.sum_todo = len(self.checks) + (1 if self.oneof_fields else 0)
+        self.percents = tuple(
+            round_half_even(100 * cnt, self.sum_todo) for cnt in range(self.sum_todo + 1)
+        ) if self.sum_todo else (0,)
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """Names of all fields the rules read."""
+        return (*(field for field, _ in self.checks), *self.oneof_fields)
+
+    def completed(self, obj) -> int:
+        cnt = 0
+        for field, check in self.checks:
+            if check(getattr(obj, field)):
+                cnt += 1
+        for field in self.oneof_fields:
+            if getattr(obj, field) != "":
+                cnt += 1
+                break
+        return cnt
+
+    def percent(self, obj) -> int:
+        return self.percents[self.completed(obj)]
+
+    def completion_expression(self):
+        """SQL expression equal to percent() for the annotated rows."""
+        if not self.sum_todo:
+            return Value(0)
+        completed = sum(
+            (Case(When(q, then=Value(1)), default=Value(0), output_field=IntegerField())
+             for q in self.q_objects),
+            Value(0),
+        )
+        if any(2 * (100 * cnt % self.sum_todo) == self.sum_todo for cnt in range(self.sum_todo + 1)):
+            return half_even_division(completed * 100, Value(self.sum_todo))
+        # No count is a tie: rounding half up is the same, in shorter SQL
+        return (completed * 200 + self.sum_todo) / (2 * self.sum_todo)
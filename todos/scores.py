@@ -0,0 +1,74 @@
+"""
+Stored per-day scores: TODOList.completion and TODOList.mood_balance.
+
+They are recomputed on every TODOList.save(); recompute() backfills history
+with one worker process per era, each writing chunked bulk_update()s.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional
+
+import django
+from django.apps import apps
+from django.db import connection, connections, transaction
+
+from todos import eras
+from todos.admin_utils import calc_compl_daily, calc_mood_balance
+from todos.models import TODOList
+
+
+SCORE_FIELDS = ('completion', 'mood_balance')
+
+
+def update_scores(obj: TODOList) -> None:
+    obj.completion = calc_compl_daily(obj)
+    obj.mood_balance = calc_mood_balance(obj)
+
+
+def _save_scores(todolists: Iterable[TODOList], chunk_size: int) -> int:
+    cnt, chunk = 0, []
+    for obj in todolists:
+        update_scores(obj)
+        chunk.append(obj)
+        if len(chunk) == chunk_size:
+            cnt += TODOList.objects.bulk_update(chunk, SCORE_FIELDS)
+            chunk = []
+    if chunk:
+        cnt += TODOList.objects.bulk_update(chunk, SCORE_FIELDS)
+    return cnt
+
+
+def _init_worker() -> None:
+    # Forked workers must not share the parent's database connection;
+    # spawned ones (Windows, macOS) have to set Django up first.
+    if not apps.ready:
+        django.setup()
+    connections.close_all()
+
+
+def recompute_era(model_label: str, chunk_size: int) -> int:
+    model = apps.get_model(model_label)
+    with transaction.atomic():
+        return _save_scores(model.objects.order_by().iterator(chunk_size), chunk_size)
+
+
+def recompute(workers: Optional[int] = None, chunk_size: int = 500) -> List[int]:
+    """Recompute stored scores of all TODOLists; return rows updated per era."""
+    labels = [era.model._meta.label for era in eras.all_eras()]
+    if workers is None:
+        workers = min(len(labels), os.cpu_count() or 1)
+    if connection.vendor == 'sqlite':
+        # SQLite allows a single writer at a time
+        workers = 1
+
+    if workers > 1:
+        connections.close_all()
+        with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+            res = list(pool.map(recompute_era, labels, [chunk_size] * len(labels)))
+    else:
+        res = [recompute_era(label, chunk_size) for label in labels]
+
+    # TODOLists outside of all eras
+    outside = TODOList.objects.order_by().filter(completion__isnull=True)
+    res.append(_save_scores(outside.iterator(chunk_size), chunk_size))
+    return res
@@ -0,0 +1,159 @@
+"""
+Full-text index of the journal: Day.dreams, events, ideas and the
+comments of the day's TODOList.
+
+The index has one row per day with text, in a table created by migration
+0021 for the database at hand:
+
+- PostgreSQL: the text and a generated tsvector column with a GIN index;
+- SQLite: an FTS5 table whose rowid is the day's Julian day number.
+
+Other databases have no index (available() is False) and the admin falls
+back to its icontains search. index_days() is called on Day and TODOList
+saves and deletes, and by the bulk TODOList saves; rebuild() reindexes
+everything.
+"""
+import datetime
+import re
+from typing import Iterable
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, QuerySet, TextField
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import SafeString, mark_safe
+
+
+TABLE = 'todos_journalindex'
+
+# Marks around the matches in snippets, replaced by <mark> after escaping
+START_SEL, STOP_SEL = '\x02', '\x03'
+
+DOCUMENT = (
+    "TRIM(COALESCE(d.dreams, '') || ' ' || COALESCE(d.events, '') || ' ' || "
+    "COALESCE(d.ideas, '') || ' ' || COALESCE(t.comments, ''))"
+)
+SOURCE = (
+    "FROM todos_day d LEFT JOIN todos_todolist t ON t.date_id = d.daydate "
+    f"WHERE {DOCUMENT} <> ''"
+)
+
+POSTGRESQL = {
+    'create': [
+        f"CREATE TABLE {TABLE} ("
+        " day_id date PRIMARY KEY REFERENCES todos_day (daydate)"
+        " ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,"
+        " document text NOT NULL,"
+        " vector tsvector GENERATED ALWAYS AS (to_tsvector('simple', document)) STORED)",
+        f"CREATE INDEX {TABLE}_vector ON {TABLE} USING gin (vector)",
+    ],
+    'drop': [f"DROP TABLE {TABLE}"],
+    'insert': f"INSERT INTO {TABLE} (day_id, document) SELECT d.daydate, {DOCUMENT} {SOURCE}",
+    'delete': f"DELETE FROM {TABLE} WHERE day_id IN ({{}})",
+    'key': "%s",
+    'match': f"{TABLE}.vector @@ websearch_to_tsquery('simple', %s)",
+    'rank': f"ts_rank({TABLE}.vector, websearch_to_tsquery('simple', %s))",
+    'snippet': (
+        f"ts_headline('simple', {TABLE}.document, websearch_to_tsquery('simple', %s), "
+        f"'StartSel={START_SEL}, StopSel={STOP_SEL}, MaxFragments=2, MaxWords=16, MinWords=6')"
+    ),
+}
+
+SQLITE = {
+    'create': [f"CREATE VIRTUAL TABLE {TABLE} USING fts5(day_id UNINDEXED, document)"],
+    'drop': [f"DROP TABLE {TABLE}"],
+    'insert': (
+        f"INSERT INTO {TABLE} (rowid, day_id, document) "
+        f"SELECT CAST(julianday(d.daydate) AS INTEGER), d.daydate, {DOCUMENT} {SOURCE}"
+    ),
+    'delete': f"DELETE FROM {TABLE} WHERE rowid IN ({{}})",
+    'key': "CAST(julianday(%s) AS INTEGER)",
+    'match': f"{TABLE} MATCH %s",
+    'rank': f"-bm25({TABLE})",
+    'snippet': f"snippet({TABLE}, 1, char(2), char(3), '…', 16)",
+}
+
+BACKENDS = {'postgresql': POSTGRESQL, 'sqlite': SQLITE}
+
+
+def available(conn=connection) -> bool:
+    return conn.vendor in BACKENDS
+
+
+def create(schema_editor) -> None:
+    """Create and fill the index (migration 0021)."""
+    backend = BACKENDS.get(schema_editor.connection.vendor)
+    if backend is not None:
+        for sql in backend['create']:
+            schema_editor.execute(sql)
+        schema_editor.execute(backend['insert'])
+
+
+def drop(schema_editor) -> None:
+    backend = BACKENDS.get(schema_editor.connection.vendor)
+    if backend is not None:
+        for sql in backend['drop']:
+            schema_editor.execute(sql)
+
+
+def index_days(dates: Iterable[datetime.date]) -> None:
+    """Reindex the journal text of the days."""
+    if not available():
+        return
+    backend, dates = BACKENDS[connection.vendor], sorted({str(date) for date in dates})
+    with connection.cursor() as cursor:
+        for i in range(0, len(dates), 500):
+            chunk = dates[i:i + 500]
+            placeholders = ", ".join([backend['key']] * len(chunk))
+            cursor.execute(backend['delete'].format(placeholders), chunk)
+            cursor.execute(
+                f"{backend['insert']} AND d.daydate IN ({', '.join(['%s'] * len(chunk))})",
+                chunk)
+
+
+def index_instance(sender, instance, **kwargs) -> None:
+    """post_save/post_delete receiver of Day and TODOList (keyed by the day)."""
+    index_days([instance.pk])
+
+
+def rebuild() -> None:
+    """Reindex all days."""
+    if not available():
+        return
+    backend = BACKENDS[connection.vendor]
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE}")
+        cursor.execute(backend['insert'])
+
+
+def _match_query(query: str) -> str:
+    if connection.vendor == 'sqlite':
+        # Every word as an FTS5 string: no query syntax errors, all words must match
+        return " ".join('"{}"'.format(word.replace('"', '""')) for word in query.split())
+    return query
+
+
+def search(days: QuerySet, query: str) -> QuerySet:
+    """
+    The days matching 'query', joined to their JournalIndex row and
+    annotated with search_rank (higher is better) and search_snippet (see
+    highlight()).
+    """
+    backend = BACKENDS[connection.vendor]
+    query = _match_query(query)
+    rank_params = [query] if '%s' in backend['rank'] else []
+    return days.filter(
+        journal__isnull=False,
+    ).filter(
+        RawSQL(backend['match'], [query], output_field=BooleanField()),
+    ).annotate(
+        search_rank=RawSQL(backend['rank'], rank_params, output_field=FloatField()),
+        search_snippet=RawSQL(backend['snippet'], rank_params, output_field=TextField()),
+    )
+
+
+def highlight(snippet: str) -> SafeString:
+    """Escaped snippet with the matched words in <mark>."""
+    html = escape(snippet or "")
+    html = html.replace(START_SEL, "<mark>").replace(STOP_SEL, "</mark>")
+    return mark_safe(re.sub(r"\s+", " ", html))
@@ -0,0 +1,166 @@
+"""
+Closed years: their TODOList changelist rows frozen into DaySnapshot rows.
+
+A past year is closed from the Year changelist. Closing renders every day
+of the year with its era admin's list_display - the row's cells, its
+completion and mood balance - into DaySnapshot. An era changelist showing
+only closed years, filtered by the date hierarchy and the list filters
+only, then pages through the snapshot (SnapshotChangeList): no TODOList
+annotations, forms or per-row display methods.
+
+A closed year's TODOLists are read-only in the admin. Reopening the year
+deletes its snapshot; close it again after changing an era's columns.
+"""
+import datetime
+from copy import copy
+from typing import FrozenSet, Iterable, List, Optional
+
+from django.contrib import admin
+from django.contrib.admin.templatetags.admin_list import ResultList, items_for_result, result_headers
+from django.contrib.admin.templatetags.admin_urls import add_preserved_filters
+from django.contrib.admin.views.main import ORDER_VAR
+from django.db import transaction
+from django.http import QueryDict
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from todos import changelist_cache, eras, generations
+from todos.models import DaySnapshot, Year
+from todos.pagination import hierarchy_range
+
+
+GENERATION = 'snapshots'
+
+_closed: Optional[FrozenSet[int]] = None
+
+
+def invalidate() -> None:
+    global _closed
+    _closed = None
+
+
+generations.register(GENERATION, invalidate)
+
+
+def closed_years() -> FrozenSet[int]:
+    global _closed
+    if _closed is None:
+        _closed = frozenset(Year.objects.filter(closed=True).values_list('yeardate', flat=True))
+    return _closed
+
+
+def is_closed(date) -> bool:
+    return datetime.date.fromisoformat(str(date)).year in closed_years()
+
+
+def _months(years: Iterable[int]) -> List[datetime.date]:
+    return [datetime.date(year, month, 1) for year in years for month in range(1, 13)]
+
+
+# -----------------------------------------------------------------------------
+# Closing and reopening
+
+
+def _rows(request, era: eras.Era, year: int) -> List[DaySnapshot]:
+    """The era's rows of the year, rendered as its changelist renders them."""
+    start = max(era.start, datetime.date(year, 1, 1))
+    stop = min(era.end, datetime.date(year + 1, 1, 1))
+    if start >= stop:
+        return []
+    # A plain changelist of the era: no query string, read-only cells
+    request = copy(request)
+    request.GET = QueryDict()
+    cl = admin.site._registry[era.model].get_changelist_instance(request)
+    cl.list_display = [name for name in cl.list_display if name != 'action_checkbox']
+
+    todolists = cl.apply_select_related(cl.root_queryset.filter(date__gte=start, date__lt=stop))
+    return [
+        DaySnapshot(
+            date=todolist.date_id,
+            year_id=year,
+            completion_pct=todolist.completion_pct,
+            balance=todolist.balance,
+            cells="".join(items_for_result(cl, todolist, None)),
+        )
+        for todolist in todolists.order_by('-date_id').iterator(chunk_size=500)
+    ]
+
+
+def close(request, years: Iterable[int]) -> int:
+    """Render the years' snapshots and mark them closed; the number of days."""
+    years = sorted(set(years))
+    with transaction.atomic():
+        rows = [row for year in years for era in eras.all_eras() for row in _rows(request, era, year)]
+        DaySnapshot.objects.filter(year__in=years).delete()
+        DaySnapshot.objects.bulk_create(rows, batch_size=500)
+        Year.objects.filter(pk__in=years).update(closed=True)
+        changelist_cache.bump(_months(years))
+        generations.bump(GENERATION)
+    return len(rows)
+
+
+def reopen(years: Iterable[int]) -> None:
+    years = sorted(set(years))
+    with transaction.atomic():
+        DaySnapshot.objects.filter(year__in=years).delete()
+        Year.objects.filter(pk__in=years).update(closed=False)
+        changelist_cache.bump(_months(years))
+        generations.bump(GENERATION)
+
+
+# -----------------------------------------------------------------------------
+# Changelist
+
+
+class SnapshotChangeList(changelist_cache.CachedKeysetChangeList):
+    """An era's changelist, served from DaySnapshot when it shows closed years only."""
+
+    def snapshot_queryset(self, request):
+        if request.method != 'GET' or self.query or ORDER_VAR in self.params:
+            return None
+        allowed = {f"{self.date_hierarchy}__{part}" for part in ('year', 'month', 'day')}
+        for spec in self.filter_specs:
+            allowed.update(spec.expected_parameters())
+        if not set(self.get_filters_params()) <= allowed:
+            return None
+
+        start, stop = hierarchy_range(self)
+        start = max(start or self.model.START, self.model.START)
+        stop = min(stop or self.model.END, self.model.END)
+        years = range(start.year, (stop - datetime.timedelta(days=1)).year + 1)
+        if start >= stop or not set(years) <= closed_years():
+            return None
+
+        snapshot = DaySnapshot.objects.filter(date__gte=start, date__lt=stop)
+        for spec in self.filter_specs:
+            snapshot = spec.queryset(request, snapshot)
+        return snapshot
+
+    def get_results(self, request):
+        self.snapshot = self.snapshot_queryset(request)
+        if self.snapshot is None:
+            return super().get_results(request)
+
+        self.queryset = self.snapshot
+        self.list_display = [name for name in self.list_display if name != 'action_checkbox']
+        self.list_editable = ()
+        super().get_results(request)
+        self.show_admin_actions = False
+
+
+def result_list(cl: SnapshotChangeList) -> dict:
+    """{% result_list %} context of a snapshot changelist: the stored rows."""
+    headers = list(result_headers(cl))
+    # The stored links to the change view lack the changelist's filters
+    preserved = escape(add_preserved_filters(
+        {'preserved_filters': cl.preserved_filters, 'opts': cl.opts}, ''))
+    return {
+        'cl': cl,
+        'result_hidden_fields': [],
+        'result_headers': headers,
+        'num_sorted_fields': sum(1 for header in headers if header['sortable'] and header['sorted']),
+        'results': [
+            ResultList(None, [mark_safe(row.cells.replace('/change/"', f'/change/{preserved}"'))])
+            for row in cl.result_list
+        ],
+    }
@@ -0,0 +1,213 @@
+"""
+Habit streaks: the current and the longest run of consecutive days a habit
+was done, one HabitStreak row per habit.
+
+A habit is a boolean of an era's TODO_FIELDS, 'noA' (done when zero) or
+'sleep' (done when at least the era's MINIMUM); "done" is the era's
+compiled rule (TODOList.RULES). A day without a TODOList, or of an era that
+doesn't track the habit, ends a run.
+
+Saving a TODOList applies the habits that changed: a new newest day
+extends or ends the current run, an edit to a past day walks the
+neighbouring days to rejoin or split its run. rebuild() recomputes all
+rows in one ordered pass over history.
+"""
+import datetime
+from functools import cache
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from django.db import models, transaction
+
+from todos import eras
+from todos.models import HabitStreak, TODOList
+from todos.rules import is_true
+
+
+ONE_DAY = datetime.timedelta(days=1)
+WALK_CHUNK = 64
+
+
+@cache
+def habit_checks(model) -> Dict[str, Callable[[Any], bool]]:
+    """The era model's habits and their checks."""
+    rules = dict(model.RULES.checks)
+    res = {}
+    for name in model.TODO_FIELDS:
+        if isinstance(TODOList._meta.get_field(name), models.BooleanField):
+            res[name] = rules.get(name, is_true)
+        elif name in ('noA', 'sleep') and name in rules:
+            res[name] = rules[name]
+    return res
+
+
+@cache
+def all_habits() -> Tuple[str, ...]:
+    """Habits of all eras, the newest era's first."""
+    res = {}
+    for era in reversed(eras.all_eras()):
+        res.update(dict.fromkeys(habit_checks(era.model)))
+    return tuple(res)
+
+
+def label(habit: str) -> str:
+    """The habit's FIELD_LABELS label in the newest era that tracks it."""
+    for era in reversed(eras.all_eras()):
+        if habit in habit_checks(era.model):
+            return era.model.FIELD_LABELS.get(habit, habit)
+    return habit
+
+
+def _checks(date: datetime.date) -> Dict[str, Callable[[Any], bool]]:
+    era = eras.for_date(date)
+    return habit_checks(era.model) if era else {}
+
+
+def _is_done(check: Optional[Callable[[Any], bool]], value) -> bool:
+    return check is not None and value is not None and check(value)
+
+
+def _date(todolist: TODOList) -> datetime.date:
+    return datetime.date.fromisoformat(str(todolist.date_id))
+
+
+def done(todolists: Iterable[TODOList]) -> Dict[datetime.date, FrozenSet[str]]:
+    """The habits done on each TODOList's day."""
+    res = {}
+    for todolist in todolists:
+        date = _date(todolist)
+        res[date] = frozenset(
+            habit for habit, check in _checks(date).items()
+            if _is_done(check, getattr(todolist, habit)))
+    return res
+
+
+# -----------------------------------------------------------------------------
+# Incremental updates
+
+
+def _walk(habit: str, date: datetime.date, step: int) -> datetime.date:
+    """The farthest day of the run through 'date' in the 'step' direction."""
+    qs = TODOList.objects.values_list('date_id', habit)
+    delta, last = step * ONE_DAY, date
+    while True:
+        if step > 0:
+            chunk = qs.filter(date__gt=last).order_by('date_id')
+        else:
+            chunk = qs.filter(date__lt=last).order_by('-date_id')
+        rows = list(chunk[:WALK_CHUNK])
+        for day, value in rows:
+            if day != last + delta or not _is_done(_checks(day).get(habit), value):
+                return last
+            last = day
+        if len(rows) < WALK_CHUNK:
+            return last
+
+
+def _extend(state: HabitStreak, date: datetime.date, is_done: bool) -> None:
+    """A new newest day."""
+    if not is_done:
+        state.current, state.current_start = 0, None
+    elif state.current and state.last_day == date - ONE_DAY:
+        state.current += 1
+    else:
+        state.current, state.current_start = 1, date
+    state.last_day = date
+    if state.current > state.longest:
+        state.longest, state.longest_start, state.longest_end = (
+            state.current, state.current_start, date)
+
+
+def _edit(state: HabitStreak, date: datetime.date, is_done: bool) -> bool:
+    """A changed past day; False when only a full rebuild can tell."""
+    habit = state.habit
+    if is_done:
+        start = _walk(habit, date, -1)
+        if state.current and state.current_start == date + ONE_DAY:
+            end = state.last_day
+        else:
+            end = _walk(habit, date, 1)
+        length = (end - start).days + 1
+        if end == state.last_day:
+            state.current, state.current_start = length, start
+        # Of equally long runs the earliest, as in a rebuild
+        if length > state.longest or (length == state.longest and start < state.longest_start):
+            state.longest, state.longest_start, state.longest_end = length, start, end
+        return True
+
+    if state.longest and state.longest_start <= date <= state.longest_end:
+        # The longest run is broken: the next longest is unknown
+        return False
+    if state.current and state.current_start <= date:
+        state.current = (state.last_day - date).days
+        state.current_start = date + ONE_DAY if state.current else None
+    return True
+
+
+def apply(old: Dict[datetime.date, FrozenSet[str]],
+          new: Dict[datetime.date, FrozenSet[str]]) -> None:
+    """Move the streaks from the 'old' to the 'new' done habits (see done())."""
+    dates = sorted({*old, *new})
+    if not dates:
+        return
+    with transaction.atomic():
+        states = {
+            state.habit: state
+            for state in HabitStreak.objects.select_for_update().filter(habit__in=all_habits())
+        }
+        if len(states) < len(all_habits()) or any(date not in new for date in dates):
+            # Missing rows or a deleted day: recompute (deleting the newest
+            # day moves every habit's current run back)
+            return rebuild()
+
+        changed, stale = set(), set()
+        for date in dates:
+            for habit, state in states.items():
+                if habit in stale:
+                    continue
+                is_done = habit in new[date]
+                if state.last_day is None or date > state.last_day:
+                    _extend(state, date, is_done)
+                elif is_done == (habit in old.get(date, ())):
+                    # Unchanged, or a new past day that keeps the gap a gap
+                    continue
+                elif not _edit(state, date, is_done):
+                    stale.add(habit)
+                    continue
+                changed.add(habit)
+
+        if stale:
+            rebuild(stale)
+        changed -= stale
+        HabitStreak.objects.bulk_update(
+            [states[habit] for habit in changed],
+            ['last_day', 'current', 'current_start', 'longest', 'longest_start', 'longest_end'])
+
+
+# -----------------------------------------------------------------------------
+# Rebuild
+
+
+def rebuild(habits: Optional[Iterable[str]] = None) -> List[HabitStreak]:
+    """Recompute the habits' rows (default: all) in one ordered pass over history."""
+    habits = tuple(habits or all_habits())
+    states = {habit: HabitStreak(habit=habit) for habit in habits}
+    rows = (TODOList.objects.order_by('date_id')
+            .values_list('date_id', *habits).iterator(chunk_size=2000))
+    for date, *values in rows:
+        checks = _checks(date)
+        for habit, value in zip(habits, values):
+            _extend(states[habit], date, _is_done(checks.get(habit), value))
+
+    with transaction.atomic():
+        HabitStreak.objects.filter(habit__in=habits).delete()
+        return HabitStreak.objects.bulk_create(states.values())
+
+
+def for_model(model) -> List[Tuple[str, HabitStreak]]:
+    """(label, streak) of the era model's habits, in TODO_FIELDS order."""
+    habits = list(habit_checks(model))
+    states = HabitStreak.objects.in_bulk(habits)
+    return [
+        (model.FIELD_LABELS.get(habit, habit), states[habit])
+        for habit in habits if habit in states
+    ]
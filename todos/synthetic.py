@@ -0,0 +1,121 @@
+"""
+Seeded synthetic history for benchmarks and local development.
+
+generate() fills whole calendar years ending with the last era: Year, Month
+and Day rows, one TODOList per day and a set of Food rows. Each day's
+TODOList follows the TODO_FIELDS and CONDITIONS of its era (days before the
+first era follow the first era). The same seed always gives the same rows.
+"""
+import datetime
+import random
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Dict, Optional
+
+from django.db import connection, models, transaction
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from todos import eras, provisioning, rollups, scores, search, streaks
+from todos.models import Day, Food, Month, TODOList, Year
+
+
+def _value(rng: random.Random, field: models.Field, conditions: dict):
+    name = field.name
+    if name in conditions.get('MINIMUM', {}):
+        minimum = conditions['MINIMUM'][name]
+        value = max(0, minimum + rng.choice([-2, -1, 0, 0, 1]))
+        return Decimal(value) if isinstance(field, models.DecimalField) else value
+    if name in conditions.get('ZERO', []):
+        return rng.choice([0, 0, 0, 1, 2])
+    if isinstance(field, models.BooleanField):
+        return rng.random() < 0.6
+    if isinstance(field, models.TextField):
+        return rng.choice(["", "", "30 min"])
+    if field.choices:
+        return rng.choice([None, *(value for value, _ in field.choices)])
+    if isinstance(field, models.DecimalField):
+        return Decimal(rng.randint(0, 10))
+    return rng.randint(0, 3)
+
+
+def _todolist(rng: random.Random, date: datetime.date, era_model) -> TODOList:
+    obj = TODOList(date_id=date)
+    for name in (*era_model.TODO_FIELDS, *era_model.INFO_FIELDS):
+        field = TODOList._meta.get_field(name)
+        if name == 'comments':
+            value = rng.choice([None, "", "synthetic day"])
+        else:
+            value = _value(rng, field, era_model.CONDITIONS)
+        setattr(obj, name, value)
+    return obj
+
+
+def generate(years: int, seed: int = 0, end_year: Optional[int] = None,
+             foods: int = 200, batch_size: int = 1000) -> Dict[str, int]:
+    """
+    Fill 'years' whole years ending with 'end_year' (default: the last era).
+
+    Existing rows are kept: already present TODOLists and Foods are skipped.
+    Rollups, the search index and the habit streaks are rebuilt at the end.
+    """
+    all_eras = eras.all_eras()
+    if end_year is None:
+        end_year = (all_eras[-1].end - datetime.timedelta(days=1)).year
+    first_year = end_year - years + 1
+    rng = random.Random(seed)
+
+    with transaction.atomic():
+        provisioning.provision(first_year, end_year)
+
+        todolists = []
+        date, end = datetime.date(first_year, 1, 1), datetime.date(end_year + 1, 1, 1)
+        while date < end:
+            era = eras.for_date(date) or all_eras[0]
+            obj = _todolist(rng, date, era.model)
+            scores.update_scores(obj)
+            todolists.append(obj)
+            date += datetime.timedelta(days=1)
+        TODOList.objects.bulk_create(todolists, batch_size=batch_size, ignore_conflicts=True)
+
+        Food.objects.bulk_create(
+            (Food(
+                name=f"food {i:04}",
+                fat=Decimal(rng.randint(0, 5000)) / 100,
+                protein=Decimal(rng.randint(0, 5000)) / 100,
+                carbs=Decimal(rng.randint(0, 8000)) / 100,
+                fiber=Decimal(rng.randint(0, 1500)) / 100,
+            ) for i in range(foods)),
+            ignore_conflicts=True,
+        )
+        rollups.rebuild()
+        search.rebuild()
+        streaks.rebuild()
+
+    return {'years': years, 'todolists': len(todolists), 'foods': foods}
+
+
+def clear() -> None:
+    """Delete all calendar, TODOList and Food rows."""
+    TODOList.objects.all().delete()
+    Day.objects.all().delete()
+    Month.objects.all().delete()
+    Year.objects.all().delete()
+    Food.objects.all().delete()
+    provisioning._known.clear()
+
+
+@contextmanager
+def test_database():
+    """Run the block against a fresh, empty test database."""
+    setup_test_environment(debug=False)
+    # Built from the current models: the old migrations call model defaults
+    # that query tables not created yet.
+    connection.settings_dict['TEST']['MIGRATE'] = False
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    with connection.schema_editor() as schema_editor:
+        search.create(schema_editor)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
@@ -0,0 +1,31 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+
+from todos import benchmark, generations, search, synthetic
+
+
+# Every era, 2016-2023
+HISTORY_YEARS = 8
+
+
+@pytest.fixture(scope='session')
+def django_db_setup(django_db_setup, django_db_blocker):
+    """The test database with synthetic history, shared by all tests."""
+    with django_db_blocker.unblock():
+        with connection.schema_editor() as schema_editor:
+            search.create(schema_editor)
+        synthetic.generate(HISTORY_YEARS)
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    """Tests roll their writes back; caches filled from them must go too."""
+    yield
+    cache.clear()
+    generations.clear_all()
+
+
+@pytest.fixture
+def staff_client(db):
+    return benchmark.staff_client()
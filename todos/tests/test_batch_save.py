@@ -0,0 +1,38 @@
+import pytest
+from django.contrib import admin
+from django.db.models import QuerySet
+
+from todos import benchmark, rollups, streaks
+from todos.models import HabitStreak, MonthStats, TODOList2023, YearStats
+
+
+@pytest.fixture
+def client(staff_client, monkeypatch):
+    model_admin = admin.site._registry[TODOList2023]
+    monkeypatch.setattr(model_admin, 'list_editable', [*TODOList2023.TODO_FIELDS, *TODOList2023.INFO_FIELDS])
+    return staff_client
+
+
+def rows(model):
+    return sorted(tuple(row.values()) for row in model.objects.values())
+
+
+def test_changelist_post_locks_and_moves_rollups(client, monkeypatch):
+    locked = []
+    select_for_update = QuerySet.select_for_update
+
+    def spy(qs, *args, **kwargs):
+        locked.append(qs.model)
+        return select_for_update(qs, *args, **kwargs)
+
+    monkeypatch.setattr(QuerySet, 'select_for_update', spy)
+    post = benchmark.changelist_post(client, TODOList2023, rows=10)
+    before = rows(MonthStats)
+    post()
+
+    assert TODOList2023 in locked
+    assert rows(MonthStats) != before
+    incremental = rows(MonthStats), rows(YearStats), rows(HabitStreak)
+    rollups.rebuild()
+    streaks.rebuild()
+    assert (rows(MonthStats), rows(YearStats), rows(HabitStreak)) == incremental
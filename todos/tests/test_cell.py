@@ -0,0 +1,104 @@
+import datetime
+import json
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+
+from todos import benchmark, rollups, search, streaks
+from todos.models import Day, HabitStreak, Month, MonthStats, TODOList2023, YearStats
+
+URL = reverse('admin:todos_todolist2023_cell')
+DATE = datetime.date(2023, 6, 15)
+FIELD = benchmark.toggle_field(TODOList2023)
+
+
+def patch(client, data):
+    return client.patch(URL, json.dumps(data), content_type='application/json')
+
+
+def rows(model):
+    return sorted(tuple(row.values()) for row in model.objects.values())
+
+
+def test_allowed_field(staff_client):
+    assert FIELD in streaks.habit_checks(TODOList2023)
+    todolist = TODOList2023.objects.get(pk=DATE)
+    version = Month.objects.get(pk=DATE.replace(day=1)).version
+
+    value = not getattr(todolist, FIELD)
+    response = patch(staff_client, {'date': str(DATE), 'field': FIELD, 'value': value})
+    assert response.status_code == 200
+    todolist.refresh_from_db()
+    assert getattr(todolist, FIELD) == value
+    assert todolist.completion == TODOList2023.RULES.percent(todolist)
+    assert response.json()['completion'] == todolist.completion
+    # The changelist cache entries of the month are stale
+    assert Month.objects.get(pk=DATE.replace(day=1)).version > version
+
+    incremental = rows(MonthStats), rows(YearStats), rows(HabitStreak)
+    rollups.rebuild()
+    streaks.rebuild()
+    assert (rows(MonthStats), rows(YearStats), rows(HabitStreak)) == incremental
+
+
+def test_comments_are_reindexed(staff_client):
+    response = patch(staff_client, {'date': str(DATE), 'field': 'comments', 'value': "zanzibar"})
+    assert response.status_code == 200
+    assert list(search.search(Day.objects.all(), "zanzibar").values_list('pk', flat=True)) == [DATE]
+
+
+@pytest.mark.parametrize('field', ['completion', 'mood_balance', 'date', 'nonexistent'])
+def test_disallowed_field(staff_client, field):
+    response = patch(staff_client, {'date': str(DATE), 'field': field, 'value': 5})
+    assert response.status_code == 400
+    assert "not editable" in response.json()['error']
+
+
+@pytest.mark.parametrize('data', [
+    {'date': str(DATE), 'field': 'noA', 'value': -3},
+    {'date': str(DATE), 'field': 'awareness', 'value': 9},
+    {'date': "2023-13-01", 'field': FIELD, 'value': True},
+    {'date': str(DATE), 'field': FIELD},
+])
+def test_bad_value(staff_client, data):
+    before = TODOList2023.objects.values().get(pk=DATE)
+    assert patch(staff_client, data).status_code == 400
+    assert TODOList2023.objects.values().get(pk=DATE) == before
+
+
+def test_day_outside_the_era(staff_client):
+    response = patch(staff_client, {'date': "2022-06-15", 'field': FIELD, 'value': True})
+    assert response.status_code == 404
+
+
+def test_anonymous_user(client, db):
+    before = TODOList2023.objects.values().get(pk=DATE)
+    response = patch(client, {'date': str(DATE), 'field': FIELD, 'value': True})
+    assert response.status_code == 302
+    assert response.url.startswith(reverse('admin:login'))
+    assert TODOList2023.objects.values().get(pk=DATE) == before
+
+
+@pytest.mark.parametrize('token', [None, "forged"])
+def test_csrf_token_required(staff_client, token):
+    client = Client(enforce_csrf_checks=True)
+    client.cookies = staff_client.cookies
+    before = TODOList2023.objects.values().get(pk=DATE)
+    headers = {} if token is None else {'HTTP_X_CSRFTOKEN': token}
+    response = client.patch(
+        URL, json.dumps({'date': str(DATE), 'field': FIELD, 'value': not before[FIELD]}),
+        content_type='application/json', **headers)
+    assert response.status_code == 403
+    assert TODOList2023.objects.values().get(pk=DATE) == before
+
+
+def test_csrf_token_accepted(staff_client):
+    client = Client(enforce_csrf_checks=True)
+    client.cookies = staff_client.cookies
+    token = client.get(benchmark.changelist_url(TODOList2023)).cookies['csrftoken'].value
+    response = client.patch(
+        URL, json.dumps({'date': str(DATE), 'field': 'comments', 'value': "with a token"}),
+        content_type='application/json', HTTP_X_CSRFTOKEN=token)
+    assert response.status_code == 200
+    assert TODOList2023.objects.get(pk=DATE).comments == "with a token"
@@ -0,0 +1,81 @@
+import pytest
+from django.db.models import Value
+
+from todos import eras
+from todos.admin_utils import calc_compl_daily, compl_daily, compl_monthly
+from todos.models import Month, MonthStats, TODOList, Year
+from todos.rules import CompletionRules, half_even_division, round_half_even
+
+
+ERAS = eras.all_eras()
+
+# (numerator, denominator, rounded): halves go to the even neighbour
+DIVISIONS = [
+    (0, 7, 0), (100, 8, 12), (300, 8, 38), (500, 8, 62), (700, 8, 88),
+    (1515, 30, 50), (1545, 30, 52), (1516, 30, 51), (1514, 30, 50),
+    (2300, 23, 100), (1150, 23, 50), (1200, 23, 52),
+]
+
+
+@pytest.mark.parametrize('numerator, denominator, rounded', DIVISIONS)
+def test_round_half_even(numerator, denominator, rounded):
+    assert round_half_even(numerator, denominator) == rounded
+    assert round_half_even(numerator, denominator) == int(round(numerator / denominator))
+
+
+def test_half_even_division_in_sql(db):
+    day = TODOList.objects.order_by().values('pk')[:1]
+    values = day.annotate(**{
+        f'd{i}': half_even_division(Value(numerator), Value(denominator))
+        for i, (numerator, denominator, _) in enumerate(DIVISIONS)
+    }).get()
+    assert [values[f'd{i}'] for i in range(len(DIVISIONS))] == [rounded for *_, rounded in DIVISIONS]
+
+
+def test_rules_round_like_round():
+    rules = CompletionRules({'TRUE': ['MED', 'MED2', 'MED3', 'DREAM', 'MILAM', 'TETRIS', 'SATYR', 'RELAX']})
+    assert rules.percents == (0, 12, 25, 38, 50, 62, 75, 88, 100)
+
+
+@pytest.mark.parametrize('era', ERAS, ids=lambda era: era.model.__name__)
+def test_sql_completion_matches_rules(db, era):
+    todolists = era.model.objects.annotate(sql_completion=era.model.RULES.completion_expression())
+    assert todolists
+    for todolist in todolists:
+        assert todolist.sql_completion == era.model.RULES.percent(todolist) == calc_compl_daily(todolist)
+        assert todolist.completion == todolist.sql_completion
+
+
+def test_sql_completion_rounds_ties_like_rules(db):
+    # Eight conditions: 1, 3, 5 and 7 of them done are ties (12.5 %, ...)
+    model = ERAS[-1].model
+    rules = CompletionRules({'TRUE': model.CONDITIONS['TRUE'][:8]})
+    assert rules.sum_todo == 8
+    todolists = model.objects.annotate(sql_completion=rules.completion_expression())
+    assert {todolist.sql_completion for todolist in todolists} >= {12, 38, 62, 88}
+    for todolist in todolists:
+        assert todolist.sql_completion == rules.percent(todolist)
+
+
+def test_monthly_completion_rounds_halves_to_even(db):
+    ties = [
+        stats for stats in MonthStats.objects.select_related('month')
+        if 2 * (stats.completion_sum % stats.days) == stats.days]
+    assert ties
+    for stats in ties:
+        expected = round_half_even(stats.completion_sum, stats.days)
+        assert expected == int(round(stats.completion_sum / stats.days)) and expected % 2 == 0
+        assert compl_monthly(stats.month) == expected
+        assert Month.objects.with_completion().get(pk=stats.month_id).completion_pct == expected
+
+
+def test_sql_monthly_completion_matches_python(db):
+    months = Month.objects.with_completion().filter(stats__isnull=False)
+    assert months
+    for month in months:
+        assert month.completion_pct == compl_monthly(month)
+
+    for year in Year.objects.with_completion().filter(stats__isnull=False):
+        todolists = TODOList.objects.filter(date__month__year=year)
+        assert year.completion_pct == int(round(
+            sum(compl_daily(todolist) for todolist in todolists) / todolists.count()))
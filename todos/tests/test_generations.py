@@ -0,0 +1,48 @@
+import datetime
+
+from todos import generations, hierarchy
+from todos.models import CacheGeneration, Month, Year
+
+
+def calendar_generation() -> int:
+    values = CacheGeneration.objects.filter(name=hierarchy.GENERATION).values_list('value', flat=True)
+    return values.first() or 0
+
+
+def test_editing_a_month_keeps_the_calendar_caches(db):
+    buckets = hierarchy.months_by_year()
+    before = calendar_generation()
+
+    month = Month.objects.get(pk=datetime.date(2023, 5, 1))
+    month.comments = "edited"
+    month.save()
+    assert calendar_generation() == before
+    assert hierarchy.months_by_year() is buckets
+
+
+def test_adding_and_deleting_calendar_rows_bumps_the_calendar(db):
+    hierarchy.months_by_year()
+    before = calendar_generation()
+
+    year = Year.objects.create(yeardate=2024)
+    assert calendar_generation() == before + 1
+    assert hierarchy.months_by_year()[2024] == ()
+
+    month = Month.objects.create(monthdate=datetime.date(2024, 1, 1), year=year)
+    assert calendar_generation() == before + 2
+    assert hierarchy.months_by_year()[2024] == (datetime.date(2024, 1, 1),)
+
+    month.delete()
+    assert calendar_generation() == before + 3
+    assert hierarchy.months_by_year()[2024] == ()
+
+
+def test_check_clears_caches_bumped_elsewhere(db):
+    generations.check(force=True)
+    buckets = hierarchy.months_by_year()
+    generations.check(force=True)
+    assert hierarchy.months_by_year() is buckets
+
+    CacheGeneration.objects.filter(name=hierarchy.GENERATION).update(value=999)
+    generations.check(force=True)
+    assert hierarchy.months_by_year() is not buckets
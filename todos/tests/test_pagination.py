@@ -0,0 +1,68 @@
+import datetime
+
+import pytest
+from django.contrib import admin
+
+from todos import benchmark
+from todos.models import TODOList2023
+
+# January 2023: 31 days on two pages of 20
+URL = benchmark.changelist_url(TODOList2023) + "?date__daydate__month=1&date__daydate__year=2023"
+JANUARY = [datetime.date(2023, 1, 31) - datetime.timedelta(days=i) for i in range(31)]
+
+
+@pytest.fixture
+def client(staff_client, monkeypatch):
+    monkeypatch.setattr(admin.site._registry[TODOList2023], 'list_per_page', 20)
+    return staff_client
+
+
+def page(client, query=""):
+    response = client.get(URL + query.replace("?", "&"))
+    assert response.status_code == 200
+    cl = response.context['cl']
+    return [todolist.pk for todolist in cl.result_list], cl.keyset
+
+
+def test_first_page(client):
+    pks, keyset = page(client)
+    assert pks == JANUARY[:20]
+    assert not keyset['newer_url']
+    assert keyset['older_url'].startswith("?before=2023-01-12&")
+
+
+def test_older_page_is_the_rest(client):
+    pks, keyset = page(client, "?before=2023-01-12")
+    assert pks == JANUARY[20:]
+    assert keyset['newer_url'].startswith("?after=2023-01-11&")
+    assert not keyset['older_url']
+
+
+def test_newer_page_returns_to_the_first(client):
+    pks, keyset = page(client, "?after=2023-01-11")
+    assert pks == JANUARY[:20]
+    assert not keyset['newer_url']
+    assert keyset['older_url'].startswith("?before=2023-01-12&")
+
+
+def test_page_boundaries_move_with_the_cursor(client):
+    pks, keyset = page(client, "?before=2023-01-30")
+    assert pks == JANUARY[2:22]
+    assert keyset['newer_url'] and keyset['older_url']
+
+    pks, keyset = page(client, "?after=2023-01-05")
+    assert pks == JANUARY[6:26]
+    assert keyset['newer_url'] and keyset['older_url']
+
+
+def test_empty_page(client):
+    pks, keyset = page(client, "?before=2023-01-01")
+    assert pks == []
+    assert not keyset['newer_url'] and not keyset['older_url']
+
+
+@pytest.mark.parametrize('query', ["?before=yesterday", "?after=2023-02-30"])
+def test_bad_cursor_redirects(client, query):
+    response = client.get(URL + query.replace("?", "&"))
+    assert response.status_code == 302
+    assert response.url.endswith("?e=1")
@@ -0,0 +1,41 @@
+import datetime
+
+import pytest
+from django.db import transaction
+
+from todos import provisioning
+from todos.models import Year
+
+KEY = (Year, 2031)
+
+
+def test_ensure_remembers_committed_rows(db, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        assert provisioning.ensure(Year, 2031) == 2031
+    assert Year.objects.filter(pk=2031).exists()
+    assert KEY in provisioning._known
+
+
+def test_ensure_forgets_rolled_back_rows(db, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                provisioning.ensure(Year, 2031)
+                raise RuntimeError
+    assert not Year.objects.filter(pk=2031).exists()
+    assert KEY not in provisioning._known
+
+    with django_capture_on_commit_callbacks(execute=True):
+        provisioning.ensure(Year, 2031)
+    assert Year.objects.filter(pk=2031).exists()
+
+
+def test_provision_creates_missing_rows(db, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        assert provisioning.provision(2030, 2031) == (2, 24, 730)
+    assert (Year, 2030) in provisioning._known
+    assert Year.objects.get(pk=2031).months.count() == 12
+    assert provisioning.provision(2031, 2031) == (1, 12, 365)
+    assert datetime.date(2031, 12, 31) in set(
+        Year.objects.get(pk=2031).months.get(pk=datetime.date(2031, 12, 1))
+        .days.values_list('pk', flat=True))
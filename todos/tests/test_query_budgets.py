@@ -0,0 +1,52 @@
+import gc
+import os
+
+import pytest
+from django.contrib import admin
+from django.core.cache import cache
+
+from todos import benchmark, generations
+from todos.models import Month
+from todos.query_budget import DEFAULT_BUDGET, QueryBudget, QueryBudgetExceeded, call_site
+
+
+# Multiplies the SQL time budgets on slow or shared machines
+TIME_SCALE = float(os.environ.get('QUERY_BUDGET_TIME_SCALE', 1))
+
+MODELS = [model for model in admin.site._registry if model._meta.app_label == 'todos']
+
+
+@pytest.mark.parametrize('model', MODELS, ids=lambda model: model.__name__)
+def test_changelist_within_query_budget(staff_client, model):
+    url = benchmark.changelist_url(model)
+    budget = getattr(admin.site._registry[model], 'query_budget', DEFAULT_BUDGET)
+    budget = budget.scaled(TIME_SCALE, label=url)
+    # Warm per-process caches (eras, date hierarchy), a cold changelist cache
+    benchmark.get(staff_client, url)()
+    cache.clear()
+    generations.check(force=True)
+    gc.collect()
+    with budget:
+        benchmark.get(staff_client, url)()
+    assert budget.queries
+
+
+def test_budget_exceeded_groups_queries_by_call_site(db):
+    with pytest.raises(QueryBudgetExceeded) as exc_info:
+        with QueryBudget(max_queries=2, label="months"):
+            for _ in range(3):
+                Month.objects.first()
+    message = str(exc_info.value)
+    assert message.startswith("months exceeded: 3 queries (budget 2)")
+    assert "   3x " in message
+    assert "todos/tests/test_query_budgets.py" in message
+
+
+def test_call_site_skips_middleware(staff_client):
+    with QueryBudget() as budget:
+        benchmark.get(staff_client, benchmark.changelist_url(Month))()
+    projects = [site.split(" via ")[0] for site, _, _ in budget.queries]
+    assert not any('generations.py' in site or 'profiling.py' in site for site in projects)
+    # The session is read by its own backend, not by this project's code
+    assert any("django/contrib/sessions" in site for site, _, _ in budget.queries)
+    assert call_site().startswith("todos/tests/test_query_budgets.py")
@@ -0,0 +1,49 @@
+import pytest
+from django.db import connection, transaction
+
+from todos import eras
+
+
+def explain(qs) -> str:
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            # Small tables would be scanned sequentially anyway
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        return qs.explain()
+
+
+def assert_date_id_range_scan(qs):
+    sql = str(qs.query).upper()
+    assert 'JOIN' not in sql
+    assert 'EXTRACT' not in sql
+    assert '"DATE_ID" >= ' in sql and '"DATE_ID" < ' in sql
+
+    plan = explain(qs)
+    if connection.vendor == 'sqlite':
+        assert 'USING' in plan, plan
+    elif connection.vendor == 'postgresql':
+        assert 'Index' in plan, plan
+
+
+@pytest.mark.parametrize('era', eras.all_eras(), ids=lambda era: era.model.__name__)
+def test_era_queryset_is_a_date_id_range_scan(db, era):
+    assert_date_id_range_scan(era.model.objects.all())
+
+
+@pytest.mark.parametrize('era', eras.all_eras(), ids=lambda era: era.model.__name__)
+def test_changelist_queries_are_date_id_range_scans(staff_client, era):
+    cl = staff_client.get(era.changelist_url).context['cl']
+    # The filtered rows (counts, keyset bounds) and the page's rows
+    assert_date_id_range_scan(cl.queryset)
+    assert_date_id_range_scan(cl.result_list)
+
+
+@pytest.mark.parametrize('era', eras.all_eras(), ids=lambda era: era.model.__name__)
+def test_changelist_rows_come_from_the_era_table(staff_client, era):
+    response = staff_client.get(era.changelist_url)
+    assert response.status_code == 200
+    sql = str(response.context['cl'].result_list.query).upper()
+    assert 'JOIN' not in sql
+    for column in ('DAYDATE', 'DREAMS', 'EVENTS', 'IDEAS', 'MONTHDATE', 'YEARDATE'):
+        assert f'"{column}"' not in sql
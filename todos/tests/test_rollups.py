@@ -0,0 +1,50 @@
+import datetime
+from importlib import import_module
+
+from django.db.migrations.loader import MigrationLoader
+
+from todos import rollups
+from todos.models import MonthStats, TODOList, YearStats
+
+
+def stats():
+    return (
+        {row.pop('month_id'): row for row in MonthStats.objects.values()},
+        {row.pop('year_id'): row for row in YearStats.objects.values()},
+    )
+
+
+def test_saves_and_deletes_keep_rollups_rebuilt(db):
+    day = TODOList.objects.get(pk=datetime.date(2023, 3, 14))
+    day.MED = not day.MED
+    day.noA = 7
+    day.save()
+    TODOList.objects.get(pk=datetime.date(2022, 12, 31)).delete()
+    incremental = stats()
+
+    rollups.rebuild()
+    assert stats() == incremental
+
+
+def test_save_rebuilds_missing_stats(db):
+    MonthStats.objects.filter(pk=datetime.date(2023, 3, 1)).delete()
+    YearStats.objects.filter(pk=2023).delete()
+    day = TODOList.objects.get(pk=datetime.date(2023, 3, 14))
+    day.MED = not day.MED
+    day.save()
+    incremental = stats()
+
+    rollups.rebuild()
+    assert stats() == incremental
+
+
+def test_migration_backfills_rollups(db, settings):
+    expected = stats()
+    MonthStats.objects.all().delete()
+    YearStats.objects.all().delete()
+
+    # The models as of the migration (the test database is built without them)
+    settings.MIGRATION_MODULES = {}
+    apps = MigrationLoader(None).project_state(('todos', '0026_backfill_rollups')).apps
+    import_module('todos.migrations.0026_backfill_rollups').backfill(apps, None)
+    assert stats() == expected
@@ -0,0 +1,120 @@
+import datetime
+import random
+
+import pytest
+
+from todos import benchmark, eras, streaks
+from todos.models import HabitStreak, TODOList, TODOList2023
+
+HABIT = benchmark.toggle_field(TODOList2023)
+
+
+def snapshot():
+    return {
+        state.habit: (state.last_day, state.current, state.current_start,
+                      state.longest, state.longest_start, state.longest_end)
+        for state in HabitStreak.objects.all()
+    }
+
+
+def assert_rebuilt():
+    incremental = snapshot()
+    streaks.rebuild()
+    assert snapshot() == incremental
+
+
+def days(start: str, stop: str):
+    """The dates of [start, stop]."""
+    start, stop = datetime.date.fromisoformat(start), datetime.date.fromisoformat(stop)
+    return [start + datetime.timedelta(days=i) for i in range((stop - start).days + 1)]
+
+
+@pytest.fixture
+def runs(db):
+    """HABIT done only on the given days, the streaks rebuilt."""
+    def set_runs(*dates):
+        TODOList.objects.update(**{HABIT: False})
+        TODOList.objects.filter(pk__in=[day for run in dates for day in run]).update(**{HABIT: True})
+        streaks.rebuild()
+    return set_runs
+
+
+def save(date: str, done: bool):
+    todolist = TODOList2023.objects.get(pk=date)
+    setattr(todolist, HABIT, done)
+    todolist.save()
+    return HabitStreak.objects.get(pk=HABIT)
+
+
+def test_past_day_joins_two_runs(runs):
+    runs(days('2023-03-05', '2023-03-09'), days('2023-03-11', '2023-03-15'))
+    state = HabitStreak.objects.get(pk=HABIT)
+    assert (state.longest, state.longest_start) == (5, datetime.date(2023, 3, 5))
+
+    state = save('2023-03-10', True)
+    assert (state.longest, state.longest_start, state.longest_end) == (
+        11, datetime.date(2023, 3, 5), datetime.date(2023, 3, 15))
+    assert state.current == 0
+    assert_rebuilt()
+
+
+def test_past_day_joins_the_current_run(runs):
+    runs(days('2023-12-20', '2023-12-25'), days('2023-12-27', '2023-12-31'))
+    state = save('2023-12-26', True)
+    assert (state.current, state.current_start) == (12, datetime.date(2023, 12, 20))
+    assert (state.longest, state.longest_start, state.longest_end) == (
+        12, datetime.date(2023, 12, 20), datetime.date(2023, 12, 31))
+    assert_rebuilt()
+
+
+def test_longest_ties_keep_the_earliest_run(runs):
+    runs(days('2023-03-01', '2023-03-04'), days('2023-03-10', '2023-03-12'))
+    state = save('2023-03-13', True)
+    assert (state.longest, state.longest_start) == (4, datetime.date(2023, 3, 1))
+    assert_rebuilt()
+
+    # Grown past it from its first day, the later run is the longest
+    state = save('2023-03-09', True)
+    assert (state.longest, state.longest_start) == (5, datetime.date(2023, 3, 9))
+    assert_rebuilt()
+
+
+def test_breaking_the_longest_of_tied_runs(runs):
+    runs(days('2023-03-01', '2023-03-04'), days('2023-03-10', '2023-03-13'))
+    assert HabitStreak.objects.get(pk=HABIT).longest_start == datetime.date(2023, 3, 1)
+
+    state = save('2023-03-02', False)
+    assert (state.longest, state.longest_start, state.longest_end) == (
+        4, datetime.date(2023, 3, 10), datetime.date(2023, 3, 13))
+    assert_rebuilt()
+
+
+def test_random_saves_match_rebuild(db):
+    """Seeded random edits, half of them to the last 60 days, of every habit."""
+    rng = random.Random(5)
+    dates = list(TODOList.objects.order_by('date_id').values_list('date_id', flat=True))
+    for i in range(80):
+        date = rng.choice(dates[-60:] if i % 2 else dates)
+        model = eras.for_date(date).model
+        todolist = model.objects.get(pk=date)
+        habit = rng.choice(list(streaks.habit_checks(model)))
+        value = getattr(todolist, habit)
+        if isinstance(value, bool):
+            value = not value
+        elif habit == 'noA':
+            value = 0 if value else 1
+        else:
+            value = 8 if value < 7 else 5
+        setattr(todolist, habit, value)
+        todolist.save()
+        assert_rebuilt()
+
+
+def test_deleting_and_readding_the_newest_day(db):
+    todolist = TODOList.objects.order_by('-date_id').first()
+    date = todolist.date_id
+    todolist.delete()
+    assert_rebuilt()
+    todolist.date_id = date
+    todolist.save(force_insert=True)
+    assert_rebuilt()
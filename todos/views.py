@@ -1,3 +1,64 @@
-from django.shortcuts import render
+import datetime
+import json
 
-# Create your views here.
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import require_http_methods
+
+from todos import changelist_cache, rollups, scores, search, snapshots, streaks
+from todos.admin_utils import format_compl, format_res
+
+
+@require_http_methods(["PATCH"])
+def todolist_cell(request, model):
+    """
+    Save a single (date, field, value) cell of an era's TODOList.
+
+    Expects a JSON body like {"date": "2023-05-17", "field": "water",
+    "value": true}. Only the era's TODO_FIELDS and INFO_FIELDS are accepted.
+    The cell is written with one UPDATE (together with the stored scores)
+    and the response carries the row's new completion.
+    """
+    try:
+        data = json.loads(request.body)
+        date = datetime.date.fromisoformat(data['date'])
+        field_name, value = data['field'], data['value']
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse(
+            {'error': "Expected JSON with 'date', 'field' and 'value'."}, status=400)
+
+    if snapshots.is_closed(date):
+        return JsonResponse({'error': f"{date.year} is closed."}, status=403)
+    if field_name not in (*model.TODO_FIELDS, *model.INFO_FIELDS):
+        return JsonResponse({'error': f"'{field_name}' is not editable."}, status=400)
+    try:
+        value = model._meta.get_field(field_name).formfield().clean(value)
+    except ValidationError as exc:
+        return JsonResponse({'error': exc.messages}, status=400)
+
+    with transaction.atomic():
+        obj = model.objects.select_for_update().filter(date_id=date).first()
+        if obj is None:
+            raise Http404(f"No {model._meta.verbose_name} for {date}.")
+        old, old_done = rollups.contributions([obj]), streaks.done([obj])
+
+        setattr(obj, field_name, value)
+        scores.update_scores(obj)
+        model.objects.filter(pk=obj.pk).update(
+            **{field_name: value},
+            **{field: getattr(obj, field) for field in scores.SCORE_FIELDS},
+        )
+        rollups.apply(old, rollups.contributions([obj]))
+        streaks.apply(old_done, streaks.done([obj]))
+        changelist_cache.bump([obj.pk])
+        if field_name == 'comments':
+            search.index_days([obj.pk])
+
+    return JsonResponse({
+        'date': str(date),
+        'field': field_name,
+        'completion': obj.completion,
+        'compl': format_compl(obj.completion),
+        'res': "-" if obj.mood_balance is None else format_res(obj.mood_balance),
+    })